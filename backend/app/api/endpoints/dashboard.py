@@ -2,11 +2,25 @@ from __future__ import annotations
 
 import re
 import time
+import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Callable, TypeVar
-
-from fastapi import APIRouter, HTTPException, Request, Query
+import random
+import heapq
+import operator
+import functools
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any, Callable, Iterable, Mapping, Tuple, TypeVar
+
+import numpy as np
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Request, Query, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 # optional http clients
 try:
@@ -14,6 +28,18 @@ try:
 except Exception:
     httpx = None
 
+# faster JSON parsing for '["a","b"]' skill cells and response encoding (optional with fallback)
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSON_ERRORS: tuple[type[BaseException], ...] = (orjson.JSONDecodeError,)
+    _RESPONSE_CLASS: type[JSONResponse] = ORJSONResponse
+except Exception:
+    _json_loads = json.loads
+    _JSON_ERRORS = (ValueError,)
+    _RESPONSE_CLASS = JSONResponse
+
 try:
     from httpcore import RemoteProtocolError
 except Exception:
@@ -21,20 +47,34 @@ except Exception:
     class RemoteProtocolError(Exception):
         pass
 
-# fuzzy matching (optional with fallback)
 try:
-    from rapidfuzz import fuzz as _rf_fuzz
-
-    def _fuzzy_ratio(a: str, b: str) -> int:
-        # use partial_ratio so short skills like "sql" match longer phrases
-        return int(_rf_fuzz.partial_ratio(a, b))
+    from h2.exceptions import StreamClosedError
 except Exception:
+    StreamClosedError = None
+
+# Exceptions worth retrying (dropped connections / half-closed HTTP/2 streams)
+_TRANSIENT_EXC: tuple[type[BaseException], ...] = tuple(
+    e
+    for e in (
+        getattr(httpx, "ReadError", None),
+        getattr(httpx, "RemoteProtocolError", None),
+        RemoteProtocolError,
+        StreamClosedError,
+    )
+    if e is not None
+)
 
-    def _fuzzy_ratio(a: str, b: str) -> int:
-        return 100 if a == b else 0
+# fuzzy matching (optional; without rapidfuzz only exact normalized matches merge)
+# partial_ratio is the scorer throughout so short skills like "sql" match longer phrases
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except Exception:
+    _rf_fuzz = None
+    _rf_process = None
 
 
-router = APIRouter()
+# list endpoints return up to MAX_LIST_LIMIT dicts; orjson encodes them without the stdlib json pass
+router = APIRouter(default_response_class=_RESPONSE_CLASS)
 T = TypeVar("T")
 
 SKILL_GAP_TABLE = "skill_gap_counts"  # evaluator writes unmatched skills here
@@ -43,22 +83,91 @@ SKILL_GAP_TABLE = "skill_gap_counts"  # evaluator writes unmatched skills here
 DEFAULT_LIST_LIMIT = 200         # default response size
 MAX_LIST_LIMIT = 2000            # hard ceiling for response size
 PAGINATION_HARD_CAP = 20000      # stop scanning after this many rows fetched
+NORMALIZE_CACHE_SIZE = 65536     # distinct raw skill strings memoized by _normalize_skill
+SPLIT_CACHE_SIZE = 32768         # distinct job/course skill cells memoized (>= PAGINATION_HARD_CAP)
+MAX_SKILL_CHARS = 64             # longer "skills" are junk (sentences, JSON blobs) and normalize to ""
+
+# Server-side aggregates over job_skills (see BACKEND_SETUP.md → Required Database Functions)
+SKILL_COUNTS_RPC = "get_skill_counts"              # lower(trim(skill)) → count, top-N as one array row
+DISTINCT_SKILLS_RPC = "get_distinct_skills"        # array_agg(DISTINCT lower(trim(skill))), normalized here
+KPI_SUMMARY_RPC = "get_kpi_summary"                # all four /kpi inputs in one row (skills as raw tokens)
+AVG_SCORE_RPC = "get_average_score"                # avg(NULLIF(score, 0)) over one batch or every batch
+RPC_OVERSHOOT = 4                # fetch limit*N rows so fuzzy dedupe still fills the response
+OFFSET_PAGE_WORKERS = 4          # concurrent page fetches for OFFSET scans (see _fetch_all_rows)
+
+_BY_COUNT = operator.itemgetter(1)  # sort key for (skill, count) pairs
+
+# Tables already warned about for OFFSET pagination (log once, not per page/request)
+_OFFSET_SCAN_WARNED: set[str] = set()
+# Page fetches for OFFSET scans run here (I/O-bound; the sync client's HTTP pool is thread-safe)
+_PAGE_POOL = ThreadPoolExecutor(max_workers=OFFSET_PAGE_WORKERS, thread_name_prefix="dashboard-page")
+
+# Tiny in-memory caches (size-bounded; TTLCache expires entries itself)
+CACHE_MAXSIZE = 512
+RESPONSE_MAX_AGE = 60  # seconds browsers may reuse a dashboard response (Cache-Control)
+_CACHE: TTLCache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=90)  # list endpoints
+_KPI_CACHE: TTLCache = TTLCache(maxsize=8, ttl=60)          # short cache to collapse dashboard spikes
+_CACHE_LOCK = threading.Lock()  # used from the loop and worker threads; TTLCache is not thread-safe
+_CORPUS_CACHE: TTLCache = TTLCache(maxsize=1, ttl=60)     # shared job_skills scan (see _get_job_skills_corpus)
+_CORPUS_SCAN_LOCK = threading.Lock()  # one scan at a time; concurrent callers wait and reuse it
+_RPC_MISSING: TTLCache = TTLCache(maxsize=16, ttl=300)     # RPCs that just failed non-transiently (see _rpc_rows)
+_SCAN_CACHE: TTLCache = TTLCache(maxsize=16, ttl=60)      # slow-changing reads (_fetch_all_rows_cached, _latest_calculated_at)
+
+def _cache_get(key: str, cache: TTLCache = _CACHE):
+    with _CACHE_LOCK:
+        try:
+            return cache[key]
+        except KeyError:
+            return None
 
-# Tiny in-memory cache
-_CACHE: dict[str, tuple[float, Any]] = {}
+def _cache_set(key: str, payload: Any, cache: TTLCache = _CACHE):
+    with _CACHE_LOCK:
+        cache[key] = payload
+
+def clear_caches() -> None:
+    """
+    Drop every cached dashboard response and scan. The orchestrator calls this when a pipeline run
+    rewrites skills or scores, so the dashboard doesn't serve the previous run until the TTLs lapse.
+    """
+    with _CACHE_LOCK:
+        for cache in (_CACHE, _KPI_CACHE, _CORPUS_CACHE, _SCAN_CACHE):
+            cache.clear()
+
+
+def _json_entry(payload: Any) -> Tuple[bytes, str]:
+    """ Encode a payload once and derive its weak ETag; the (body, etag) pair is what gets cached. """
+    body = _RESPONSE_CLASS(payload).body
+    return body, f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _conditional_response(request: Request, entry: Tuple[bytes, str]) -> Response:
+    """ 304 when the browser already holds this body (If-None-Match), else the pre-encoded JSON. """
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": f"max-age={RESPONSE_MAX_AGE}"}
+    if etag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-def _cache_get(key: str, ttl: float):
-    v = _CACHE.get(key)
-    if not v:
-        return None
-    ts, payload = v
-    if time.time() - ts > ttl:
-        _CACHE.pop(key, None)
-        return None
-    return payload
 
-def _cache_set(key: str, payload: Any):
-    _CACHE[key] = (time.time(), payload)
+def _build_entry(build: Callable[..., Any], *args: Any) -> Tuple[bytes, str]:
+    return _json_entry(build(*args))
+
+
+async def _cached_response(
+    request: Request, key: str, build: Callable[..., Any], *args: Any, cache: TTLCache = _CACHE
+) -> Response:
+    """
+    Serve build(*args) through the TTL cache as pre-encoded JSON with an ETag.
+    Polling dashboards then cost a dict lookup (or a bodiless 304) until the entry expires.
+    Hits are answered on the event loop; only a miss takes a worker thread, where build runs
+    its blocking Supabase calls (and the encode) without stalling other requests.
+    """
+    entry = _cache_get(key, cache)
+    if entry is None:
+        entry = await asyncio.to_thread(_build_entry, build, *args)
+        _cache_set(key, entry, cache)
+    return _conditional_response(request, entry)
+
 
 # Helpers
 def _get_sb(request: Request):
@@ -68,28 +177,64 @@ def _get_sb(request: Request):
     return sb
 
 
-def _retry_supabase_sync(call: Callable[[], T], attempts: int = 3, base_delay: float = 0.2) -> T:
-    """ Retry wrapper for transient Supabase/HTTP errors. """
+# Shared circuit breaker: after a run of transient failures, stop retrying (and sleeping) for a
+# short cooldown so a Supabase blip isn't amplified by every in-flight request retrying into it.
+BREAKER_FAILURES = 5
+BREAKER_COOLDOWN_S = 10.0
+_breaker_failures = 0
+_breaker_open_until = 0.0
+_BREAKER_LOCK = threading.Lock()
+
+
+def _breaker_record(ok: bool) -> None:
+    global _breaker_failures, _breaker_open_until
+    with _BREAKER_LOCK:
+        if ok:
+            _breaker_failures = 0
+            return
+        _breaker_failures += 1
+        if _breaker_failures >= BREAKER_FAILURES:
+            _breaker_open_until = time.monotonic() + BREAKER_COOLDOWN_S
+            _breaker_failures = 0
+
+
+def _retry_supabase_sync(
+    op: Callable[..., T],
+    *args: Any,
+    attempts: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    **kwargs: Any,
+) -> T:
+    """
+    Retry op(*args, **kwargs) on transient Supabase/HTTP errors, with full-jitter exponential backoff
+    (capped at max_delay). While the shared breaker is open, op is tried once and errors surface immediately.
+    Pass the bound method itself (`_retry_supabase_sync(q.execute)`) rather than wrapping it in a lambda.
+    Blocking sleep is fine here: every caller runs in a worker thread (sync endpoints in
+    Starlette's threadpool, /kpi via asyncio.to_thread), never on the event loop.
+    """
+    if time.monotonic() < _breaker_open_until:
+        attempts = 1
     last_exc: Exception | None = None
     for i in range(1, attempts + 1):
         try:
-            return call()
-        except Exception as e:
-            transient = (
-                (httpx is not None and isinstance(e, (getattr(httpx, "ReadError", Exception), getattr(httpx, "RemoteProtocolError", Exception))))
-                or isinstance(e, RemoteProtocolError)
-                or "StreamClosedError" in repr(e)
-                or "Server disconnected" in repr(e)
-            )
-            if not transient or i == attempts:
+            result = op(*args, **kwargs)
+        except _TRANSIENT_EXC as e:
+            _breaker_record(False)
+            if i == attempts:
                 raise
-            delay = base_delay * (2 ** (i - 1))
+            # full jitter: spread concurrent retries instead of having them hit Supabase in lockstep
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** (i - 1))))
             logging.warning(
                 f"[dashboard] transient supabase error on attempt {i}/{attempts}: {e!r}; "
-                f"retrying in {delay:.1f}s"
+                f"retrying in {delay:.2f}s"
             )
             time.sleep(delay)
             last_exc = e
+        else:
+            if _breaker_failures:
+                _breaker_record(True)
+            return result
     assert last_exc is not None
     raise last_exc
 
@@ -103,19 +248,64 @@ def _fetch_all_rows(
     hard_cap: int | None = PAGINATION_HARD_CAP,
 ) -> List[Dict[str, Any]]:
     """
-    Paginate with optional stable ORDER BY to avoid dup/miss rows across pages.
-    Obeys a hard cap to prevent runaway scans under heavy datasets.
+    Paginate a table while obeying a hard cap to prevent runaway scans under heavy datasets.
+    - order_col given: keyset pagination (ORDER BY order_col, WHERE order_col > last seen);
+      order_col must be unique and monotonically increasing (e.g. a serial/uuid primary key).
+      It is added to the projection automatically, so callers only list the columns they read.
+    - order_col None: legacy LIMIT/OFFSET via .range(), which re-scans skipped rows on every page.
     """
     out: List[Dict[str, Any]] = []
-    start = 0
+
+    if order_col:
+        select_cols = columns
+        if order_col not in {c.strip() for c in columns.split(",")}:
+            select_cols = f"{columns}, {order_col}"
+        last_id: Any = None
+        while True:
+            q = sb.from_(table).select(select_cols).order(order_col, desc=False).limit(chunk)
+            if last_id is not None:
+                q = q.gt(order_col, last_id)
+            resp = _retry_supabase_sync(q.execute)
+            rows = resp.data or []
+            out.extend(rows)
+            if len(rows) < chunk:
+                break
+            last_id = rows[-1].get(order_col)
+            if last_id is None:
+                break
+            if hard_cap and len(out) >= hard_cap:
+                break
+        return out
+
+    if table not in _OFFSET_SCAN_WARNED:
+        _OFFSET_SCAN_WARNED.add(table)
+        logging.warning(f"[dashboard] OFFSET pagination on '{table}'; pass order_col to use keyset pagination")
+
+    def _page(start: int) -> List[Dict[str, Any]]:
+        q = sb.from_(table).select(columns).range(start, start + chunk - 1)
+        return _retry_supabase_sync(q.execute).data or []
+
+    # page 0 first: a table that fits in one page needs no count and no second round-trip
+    out = _page(0)
+    if len(out) < chunk or (hard_cap and len(out) >= hard_cap):
+        return out
+
+    # OFFSET pages don't depend on each other: once the row count is known, fetch the rest concurrently
+    try:
+        head = _retry_supabase_sync(sb.from_(table).select(columns, count="exact", head=True).execute)
+        total = getattr(head, "count", None)
+    except Exception:
+        total = None
+    if total is not None:
+        limit_rows = min(int(total), hard_cap) if hard_cap else int(total)
+        for rows in _PAGE_POOL.map(_page, range(chunk, limit_rows, chunk)):
+            out.extend(rows)
+        return out
+
+    # count unavailable: walk pages until a short one
+    start = chunk
     while True:
-        end = start + chunk - 1
-        if order_col:
-            q = sb.from_(table).select(columns).order(order_col, desc=False).range(start, end)
-        else:
-            q = sb.from_(table).select(columns).range(start, end)
-        resp = _retry_supabase_sync(lambda: q.execute())
-        rows = resp.data or []
+        rows = _page(start)
         out.extend(rows)
         if len(rows) < chunk:
             break
@@ -125,25 +315,113 @@ def _fetch_all_rows(
     return out
 
 
-def get_average_alignment_score_local(sb) -> float:
-    """ Calculates the average alignment score by fetching all scores and performing the average calculation in Python. """
+def _fetch_all_rows_cached(
+    sb,
+    table: str,
+    columns: str,
+    chunk: int = 1000,
+    order_col: str | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    _fetch_all_rows memoized for ~60s per (table, columns, order_col), so repeated dashboard loads
+    reuse one scan of slow-changing tables. Rows are shared between callers: treat them as read-only.
+    Fetch errors propagate and are not cached.
+    """
+    key = f"scan:{table}:{columns}:{order_col}"
+    rows = _cache_get(key, _SCAN_CACHE)
+    if rows is None:
+        rows = _fetch_all_rows(sb, table, columns, chunk=chunk, order_col=order_col)
+        _cache_set(key, rows, _SCAN_CACHE)
+    return rows
+
+
+def _rpc_rows(sb, fn: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]] | None:
+    """
+    Call a Postgres function through PostgREST.
+    Returns None (instead of raising) when the RPC is missing or fails, so callers can fall back to a scan.
+    A function that fails for a non-transient reason (typically not installed) is skipped for a few
+    minutes, so the fallback paths don't pay a doomed round-trip in front of every request.
+    """
+    if _cache_get(fn, _RPC_MISSING) is not None:
+        return None
     try:
-        rows = _fetch_all_rows(sb, "course_alignment_scores_clean", "score", chunk=1000, order_col=None)
+        resp = _retry_supabase_sync(sb.rpc(fn, params or {}).execute)
+    except Exception as e:
+        logging.warning(f"[dashboard] rpc {fn} unavailable: {e!r}; falling back to table scan")
+        if not isinstance(e, _TRANSIENT_EXC):
+            _cache_set(fn, True, _RPC_MISSING)
+        return None
+    return resp.data if resp.data is not None else []
+
+
+def _fetch_column(
+    sb,
+    table: str,
+    col: str,
+    order_col: str,
+    dtype: Any = np.float64,
+    chunk: int = 1000,
+    hard_cap: int | None = PAGINATION_HARD_CAP,
+    eq: Tuple[str, Any] | None = None,
+) -> np.ndarray:
+    """
+    Keyset-paginate a single numeric column straight into a NumPy array (NULLs dropped),
+    instead of materializing a list of row dicts for the caller to pick apart.
+    eq=(column, value) restricts the scan to matching rows (e.g. one evaluator batch).
+    """
+    parts: List[np.ndarray] = []
+    fetched = 0
+    last_id: Any = None
+    while True:
+        q = sb.from_(table).select(f"{col}, {order_col}").order(order_col, desc=False).limit(chunk)
+        if eq is not None:
+            q = q.eq(*eq)
+        if last_id is not None:
+            q = q.gt(order_col, last_id)
+        rows = _retry_supabase_sync(q.execute).data or []
+        if rows:
+            parts.append(np.fromiter((r[col] for r in rows if r.get(col) is not None), dtype=dtype))
+        fetched += len(rows)
+        if len(rows) < chunk:
+            break
+        last_id = rows[-1].get(order_col)
+        if last_id is None:
+            break
+        if hard_cap and fetched >= hard_cap:
+            break
+    return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+def get_average_alignment_score_local(sb, calculated_at: str | None = None) -> float:
+    """
+    Average alignment score over one evaluator batch (calculated_at) or every batch, ignoring zero/null scores.
+    Asks Postgres for the number (get_average_score RPC); only when it is not installed
+    are the scores paginated into NumPy and averaged here.
+    """
+    agg = _rpc_rows(sb, AVG_SCORE_RPC, {"p_calculated_at": calculated_at} if calculated_at else None)
+    if agg:
+        return round(float(agg[0].get("avg_score") or 0), 2)
+
+    try:
+        scores = _fetch_column(
+            sb, "course_alignment_scores_clean", "score", order_col="course_alignment_score_clean_id",
+            eq=("calculated_at", calculated_at) if calculated_at else None,
+        )
     except Exception as e:
         logging.error(f"Error fetching scores for average calculation: {e!r}")
         return 0.0
 
-    # EXCLUDE zero and null scores
-    scores = [r.get("score") for r in rows if r.get("score") not in (None, 0)]
-    if not scores:
+    # EXCLUDE zero and null scores (nulls are already dropped by _fetch_column)
+    scores = scores[scores != 0]
+    if scores.size == 0:
         return 0.0
-    avg_score = sum(scores) / len(scores)
-    return round(avg_score, 2)
+    return round(float(scores.mean()), 2)
 
 
-def _split_skills_maybe_list(value: Any) -> List[str]:
+def _split_skills_maybe_list(value: Any) -> Tuple[str, ...]:
     """
-    Converts the skills data into a list of lowercase strings.
+    Converts the skills data into a tuple of lowercase strings (callers only iterate it,
+    so cached text cells are handed out as-is instead of being copied into a fresh list).
     Handles:
     - ['Python', 'SQL']
     - "Python, SQL"
@@ -151,28 +429,35 @@ def _split_skills_maybe_list(value: Any) -> List[str]:
     - None
     """
     if value is None:
-        return []
+        return ()
+
+    # JSON text list / comma-delimited text (memoized: the same cells are re-read by every endpoint)
+    if isinstance(value, str):
+        return _split_skills_text(value)
 
     # True list
     if isinstance(value, list):
-        return [str(s).strip().lower() for s in value if str(s).strip()]
-
-    # JSON text list
-    if isinstance(value, str):
-        s = value.strip()
-        if s.startswith("[") and s.endswith("]"):
-            try:
-                arr = json.loads(s)
-                if isinstance(arr, list):
-                    return [str(x).strip().lower() for x in arr if str(x).strip()]
-            except Exception:
-                pass
-        # comma-delimited fallback
-        return [x.strip().lower() for x in s.split(",") if x.strip()]
+        return tuple(filter(None, [str(s).strip().lower() for s in value]))
 
     # Fallback scalar
     sval = str(value).strip().lower()
-    return [sval] if sval else []
+    return (sval,) if sval else ()
+
+
+@functools.lru_cache(maxsize=SPLIT_CACHE_SIZE)
+def _split_skills_text(value: str) -> tuple[str, ...]:
+    """ String branch of _split_skills_maybe_list; returns a tuple so cached results stay immutable. """
+    s = value.strip()
+    # cheap prefix/suffix probe first: plain "a, b" cells never reach the JSON parser
+    if s.startswith("[") and s.endswith("]"):
+        try:
+            arr = _json_loads(s)
+            if isinstance(arr, list):
+                return tuple(filter(None, [str(x).strip().lower() for x in arr]))
+        except _JSON_ERRORS:
+            pass
+    # comma-delimited fallback: lowercase the cell once, then strip/drop empties via C-level map/filter
+    return tuple(filter(None, map(str.strip, s.lower().split(","))))
 
 
 # Normalization & dedupe for skills
@@ -195,11 +480,58 @@ _PREFIXES = (
     "administering ",
 )
 
+# One anchored alternation instead of a startswith() per prefix
+_PREFIX_RE = re.compile(r"^(?:" + "|".join(re.escape(p.rstrip()) for p in _PREFIXES) + r")\s+")
+# First words of _PREFIXES: the regex only runs when the skill starts with one of these
+_PREFIX_FIRSTS = frozenset(p.split()[0] for p in _PREFIXES)
+
 # keep alphanumerics, +, #, and whitespace; replace other punct with space
-_PUNCT_RE = re.compile(r"[^a-z0-9\+\#\s]+")
-_WS_RE = re.compile(r"\s+")
+_PUNCT_KEEP = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+
+def _punct_to_space(cp: int) -> str:
+    ch = chr(cp)
+    return ch if (ch in _PUNCT_KEEP or ch.isspace()) else " "
+
+
+class _PunctToSpace(dict):
+    """ str.translate table: kept chars map to themselves, everything else to a space. """
 
+    def __missing__(self, cp: int) -> str:
+        # rare non-Latin-1 code points are resolved once, then memoized
+        out = self[cp] = _punct_to_space(cp)
+        return out
 
+
+# Latin-1 is filled up front so the common path is a plain dict hit inside str.translate
+_PUNCT_TABLE = _PunctToSpace({cp: _punct_to_space(cp) for cp in range(256)})
+
+
+# Last words that end in "s" but are not plurals ("express js", "ms windows", "ci jenkins")
+_PLURAL_KEEP = frozenset({
+    "js", "kubernetes", "windows", "jenkins", "devops", "pandas", "aws", "ios", "macos", "rails",
+})
+# Singular endings that happen to end in "s": "business", "status", "analysis", "analytics".
+# Only -sis/-tis, not any -is, so acronym plurals ("apis", "kpis", "uis") still lose their "s".
+_SINGULAR_ENDINGS = ("ss", "us", "sis", "tis", "ics")
+
+
+def _singularize(s: str) -> str:
+    """
+    Rule-based plural trim on the last word (no stemmer: the result is shown as the skill name,
+    so "data analysis" must stay readable rather than becoming "data analysi").
+    """
+    last = s.rpartition(" ")[2]
+    if last in _PLURAL_KEEP or s.endswith(_SINGULAR_ENDINGS):
+        return s
+    if s.endswith("ies"):
+        return s[:-3] + "y"  # technologies -> technology
+    if s.endswith(("sses", "xes")):
+        return s[:-2]  # processes -> process, indexes -> index
+    return s[:-1]
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def _normalize_skill(raw: str) -> str:
     """
     Canonical normalization for grouping:
@@ -207,63 +539,131 @@ def _normalize_skill(raw: str) -> str:
     - drop leading stopword tokens ("experience", "using", "strong", ...)
     - strip common leading phrases/verbs ("using ", "building ", ...)
     - remove most punctuation (keep + and #), collapse whitespace
-    - very light plural trim (trailing 's' for longer tokens)
+    - very light plural trim for longer skills (see _singularize)
+    - fold ALIASES variants into their canonical name ("reactjs" -> "react")
+    Memoized: skills like "python" / "sql" recur across thousands of rows.
+    Strings over MAX_SKILL_CHARS are rejected up front so bad rows can't dominate the cost.
     """
-    s = (raw or "").strip().lower()
+    if not raw or len(raw) > MAX_SKILL_CHARS:
+        return ""
+    s = raw.strip().lower()
     if not s:
         return ""
 
-    # Drop leading noise tokens so "experience using sql" -> "sql"
-    tokens = s.split()
-    while tokens and tokens[0] in STOPWORDS:
-        tokens.pop(0)
-    s = " ".join(tokens)
-
-    # Strip known prefixes if still present
-    for p in _PREFIXES:
-        if s.startswith(p):
-            s = s[len(p):]
-            break
-
-    s = _PUNCT_RE.sub(" ", s)
-    s = _WS_RE.sub(" ", s).strip()
+    if s.isascii() and s.isalnum():
+        # single plain token ("python", "sql"): no prefix, punctuation or whitespace to touch
+        if s in STOPWORDS:
+            return ""
+    else:
+        # Drop leading noise tokens so "experience using sql" -> "sql"
+        # (walk an index instead of pop(0), which shifts the whole list each time)
+        tokens = s.split()
+        i = 0
+        while i < len(tokens) and tokens[i] in STOPWORDS:
+            i += 1
+        s = " ".join(tokens[i:])
+
+        # Strip known prefixes if still present (match + slice: no new string when nothing hits)
+        if i < len(tokens) and tokens[i] in _PREFIX_FIRSTS:
+            m = _PREFIX_RE.match(s)
+            if m:
+                s = s[m.end():]
+
+        # punctuation -> space, then collapse whitespace runs (both in C)
+        s = " ".join(s.translate(_PUNCT_TABLE).split())
 
     # light plural normalization (avoid over-aggressive trimming)
     if len(s) > 8 and s.endswith("s"):
-        s = s[:-1]
+        s = _singularize(s)
+
+    # aliases are keyed by whole normalized skills, so this is one dict hit (cached with the rest)
+    return ALIASES.get(s, s)
 
-    return s
 
+FUZZY_BLOCK_ROWS = 256  # rows per cdist block; bounds the score matrix to BLOCK x N
 
-def _dedupe_frequency(freq: Dict[str, int], threshold: int = 85) -> Dict[str, int]:
+
+def _dedupe_frequency(
+    freq: Dict[str, int],
+    threshold: int = 85,
+    keep: Callable[[str], bool] | None = None,
+) -> Dict[str, int]:
     """
     Fuzzy-dedupe a frequency dict {skill: count}:
+    - drop skills failing keep(skill) (if given) in the same pass that normalizes every skill once
     - iterate by highest count first
     - merge into an existing representative if fuzzy ratio >= threshold
+    With rapidfuzz, scores are computed block-wise by process.cdist (C, multi-threaded) against
+    the current representatives only, and the greedy walk only reads the matrices.
     """
     if not freq:
         return {}
-    items = sorted(freq.items(), key=lambda kv: kv[1], reverse=True)
-    merged: Dict[str, int] = {}
+    items = sorted(freq.items(), key=_BY_COUNT, reverse=True)
+
+    norms: List[str] = []
+    counts: List[int] = []
     for skill, count in items:
-        norm = _normalize_skill(skill)
-        if not norm:
+        if keep is not None and not keep(skill):
             continue
-        representative = None
-        for rep in merged.keys():
-            if _fuzzy_ratio(norm, rep) >= threshold:
-                representative = rep
-                break
-        if representative is None:
-            merged[norm] = count
+        norm = _normalize_skill(skill)
+        if norm:
+            norms.append(norm)
+            counts.append(count)
+
+    merged: Dict[str, int] = {}
+    if _rf_process is None:
+        # exact matching only: the pairwise walk collapses to summing counts per normalized key
+        for norm, count in zip(norms, counts):
+            merged[norm] = merged.get(norm, 0) + count
+        return merged
+
+    def _hits(queries: List[str], choices: List[str]) -> np.ndarray:
+        scores = _rf_process.cdist(
+            queries,
+            choices,
+            scorer=_rf_fuzz.partial_ratio,
+            processor=None,
+            score_cutoff=threshold,
+            workers=-1,
+        )
+        return scores >= threshold
+
+    # Only representatives can absorb a skill, so each block is scored against the representatives
+    # found so far plus its own rows, not against every earlier skill (most of which were merged away).
+    reps: List[str] = []
+    for start in range(0, len(norms), FUZZY_BLOCK_ROWS):
+        end = min(start + FUZZY_BLOCK_ROWS, len(norms))
+        block = norms[start:end]
+        # earlier blocks' representatives are fixed, so their first hit per row is one vectorized argmax
+        if reps:
+            prev_hits = _hits(block, reps)
+            prev_any = prev_hits.any(axis=1)
+            prev_first = prev_hits.argmax(axis=1)
         else:
-            merged[representative] += count
+            prev_any = np.zeros(end - start, dtype=bool)
+            prev_first = None
+        inner_hits = _hits(block, block)
+        block_is_rep = np.zeros(end - start, dtype=bool)
+        for r in range(end - start):
+            # earlier blocks' representatives come first in merge order
+            if prev_any[r]:
+                merged[reps[prev_first[r]]] += counts[start + r]
+                continue
+            match = np.flatnonzero(inner_hits[r, :r] & block_is_rep[:r])
+            if match.size:
+                merged[block[match[0]]] += counts[start + r]
+            else:
+                merged[block[r]] = counts[start + r]
+                block_is_rep[r] = True
+        reps.extend(block[r] for r in np.flatnonzero(block_is_rep))
     return merged
 
 
-# Simple alias support (deterministic)
+# Simple alias support (deterministic), applied at the end of _normalize_skill
 # Map normalized *variants* -> *canonical* names. Start small; grow as needed.
-ALIASES: Dict[str, str] = {
+# Read-only: the canonical forms are memoized by _normalize_skill's lru_cache, so edits at
+# runtime would never reach already-cached skills.
+ALIASES: Mapping[str, str] = MappingProxyType({
     "js": "javascript",
     "react js": "react",
     "reactjs": "react",
@@ -271,86 +671,111 @@ ALIASES: Dict[str, str] = {
     "nodejs": "node",
     "python3": "python",
     "sql query": "sql",
-    "sql querie": "sql",
-}
+})
 
 # Generic noise tokens to ignore
-STOPWORDS = {
+STOPWORDS = frozenset({
     "and", "or", "of", "the", "to", "in", "for", "with", "on",
     "using", "experience", "knowledge", "background",
     "skills", "skill", "ability",
     "strong", "hands-on", "proficient", "familiar",
-}
+})
 
 
-def _fold_aliases_counts(freq: Dict[str, int], aliases: Dict[str, str]) -> Dict[str, int]:
-    """ Fold a {skill: count} dict through ALIASES so variants accumulate into a canonical key. """
-    if not freq:
-        return {}
-    out: Dict[str, int] = {}
-    for k, v in freq.items():
-        canon = aliases.get(k, k)
-        out[canon] = out.get(canon, 0) + v
-    return out
+def _keep_normalized(norm: str) -> bool:
+    """ Noise filter shared by the normalized count/set builders. """
+    return bool(norm) and norm not in STOPWORDS and len(norm) >= 2
 
 
-def _fold_aliases_set(items: List[str] | set[str], aliases: Dict[str, str]) -> set[str]:
-    """ Map each normalized course skill through ALIASES so coverage aligns with job variants. """
-    result: set[str] = set()
-    for k in items:
-        result.add(aliases.get(k, k))
-    return result
+def _normalize_counts(
+    raw_counts: Iterable[Tuple[str, int]],
+    keep: Callable[[str], bool] = bool,
+) -> Counter[str]:
+    """
+    Batch form of _normalize_skill for (raw skill, count) pairs: each distinct raw skill is
+    normalized once and its count carried over to the canonical form; keep() filters the result.
+    """
+    normalize = _normalize_skill
+    freq: Counter[str] = Counter()
+    for raw, count in raw_counts:
+        norm = normalize(raw)
+        if keep(norm):
+            freq[norm] += count
+    return freq
 
 
-def _build_normalized_counts(rows: List[Dict[str, Any]], field: str) -> Dict[str, int]:
+def _build_normalized_counts(rows: List[Dict[str, Any]], field: str) -> Counter[str]:
     """ Split + normalize a field and return frequency counts, filtering noise. Works for both job_skills and course_skills. """
-    freq: Dict[str, int] = {}
-    for r in rows:
-        for raw in _split_skills_maybe_list(r.get(field, "")):
-            norm = _normalize_skill(raw)
-            if not norm:
-                continue
-            if norm in STOPWORDS:
-                continue
-            if len(norm) < 2:
-                continue
-            freq[norm] = freq.get(norm, 0) + 1
-    return freq
+    raw_counts: Counter[str] = Counter(
+        raw for r in rows for raw in _split_skills_maybe_list(r.get(field, ""))
+    )
+    return _normalize_counts(raw_counts.items(), keep=_keep_normalized)
 
 
 def _build_normalized_set(rows: List[Dict[str, Any]], field: str) -> set[str]:
     """ Split + normalize a field and return a distinct set, filtering noise. """
-    s: set[str] = set()
+    raw_tokens: set[str] = set()
     for r in rows:
-        for raw in _split_skills_maybe_list(r.get(field, "")):
-            norm = _normalize_skill(raw)
-            if not norm:
-                continue
-            if norm in STOPWORDS:
-                continue
-            if len(norm) < 2:
-                continue
-            s.add(norm)
-    return s
+        raw_tokens.update(_split_skills_maybe_list(r.get(field, "")))
+    return {norm for norm in map(_normalize_skill, raw_tokens) if _keep_normalized(norm)}
+
+
+# first char -> (sorted lengths, members sorted by length)
+FuzzyBuckets = Dict[str, Tuple[List[int], List[str]]]
+
+
+def _bucket_population(population: Iterable[str]) -> FuzzyBuckets:
+    """ Index a population once by first letter (length-sorted) so _is_fuzzy_member can bisect its length band. """
+    grouped: Dict[str, List[str]] = defaultdict(list)
+    for p in population:
+        if p:
+            grouped[p[0]].append(p)
+    buckets: FuzzyBuckets = {}
+    for ch, members in grouped.items():
+        members.sort(key=len)
+        buckets[ch] = ([len(p) for p in members], members)
+    return buckets
 
 
-def _is_fuzzy_member(term: str, population: set[str], threshold: int = 88) -> bool:
+def _is_fuzzy_member(
+    term: str,
+    population: set[str] | frozenset[str],
+    threshold: int = 88,
+    buckets: FuzzyBuckets | None = None,
+) -> bool:
     """
     Returns True if term fuzzily matches any member of population with ratio >= threshold.
     Fast-fail exact match; then prefilter candidates by first letter and length band.
+    Pass buckets=_bucket_population(population) when testing many terms against the same population.
     """
     if not term or not population:
         return False
     if term in population:
         return True
-    t0 = term[0]
+    if _rf_process is None:
+        # fallback scorer is 100 only on equality, which the exact check above already covered
+        return False
+    if buckets is None:
+        buckets = _bucket_population(population)
+    bucket = buckets.get(term[0])
+    if not bucket:
+        return False
+    lengths, members = bucket
     L = len(term)
-    # quick prefilter to cut comparisons drastically
-    candidates = [p for p in population if p and p[0] == t0 and abs(len(p) - L) <= 3]
-    for p in candidates:
-        if _fuzzy_ratio(term, p) >= threshold:
-            return True
-    return False
+    # quick prefilter to cut comparisons drastically: same first letter, |len diff| <= 3
+    candidates = members[bisect_left(lengths, L - 3):bisect_right(lengths, L + 3)]
+    if not candidates:
+        return False
+    if threshold >= 100:
+        # partial_ratio is 100 exactly when the shorter string occurs inside the longer one,
+        # so the strict (debug) cutoff needs substring tests only, no alignment scoring
+        return any((term in c) if L <= len(c) else (c in term) for c in candidates)
+    # partial_ratio can reach 100 for any length pair (substring alignment), so there is no
+    # length-only bound to reject with; score_cutoff lets rapidfuzz bail out per candidate instead.
+    hit = _rf_process.extractOne(
+        term, candidates, scorer=_rf_fuzz.partial_ratio, processor=None, score_cutoff=threshold
+    )
+    return hit is not None
 
 
 # --------------------------- Matched (market) skills reader ---------------------------
@@ -362,27 +787,73 @@ def _get_matched_course_skills(sb) -> set[str]:
     Handles list or comma-separated strings per row.
     """
     try:
-        rows = _fetch_all_rows(sb, "course_alignment_scores_clean", "skills_in_market", chunk=1000, order_col=None)
+        rows = _fetch_all_rows_cached(sb, "course_alignment_scores_clean", "skills_in_market", chunk=1000, order_col=None)
     except Exception:
         rows = []
 
-    matched_set: set[str] = set()
-    if rows:
-        for r in rows:
-            for raw in _split_skills_maybe_list(r.get("skills_in_market")):
-                norm = _normalize_skill(raw)
-                if not norm:
-                    continue
-                if norm in STOPWORDS:
-                    continue
-                if len(norm) < 2:
-                    continue
-                matched_set.add(norm)
-
-    # Fold aliases so coverage aligns with job variants
-    if matched_set:
-        matched_set = _fold_aliases_set(matched_set, ALIASES)
-    return matched_set
+    # The evaluator writes the same market skills into many course rows; _build_normalized_set
+    # collapses them to distinct tokens before normalizing. (Its normalize_skills() keeps "."
+    # and leading verbs, so the stored values still need our _normalize_skill pass.)
+    return _build_normalized_set(rows, "skills_in_market")
+
+
+# --------------------------- Shared job_skills corpus ---------------------------
+
+def _get_job_skills_corpus(sb) -> Tuple[Counter[str], Counter[str], int]:
+    """
+    One stable-ordered job_skills scan shared by /skills, /raw-skills-count, /missing-skills and /kpi
+    (used when the aggregate RPCs are unavailable). Cached briefly so a dashboard load scans once.
+    Returns (raw_counter, normalized_counter, unique_skill_count); treat the counters as read-only.
+    Raises on fetch errors (failures are not cached).
+    """
+    corpus = _cache_get("job_skills:corpus", _CORPUS_CACHE)
+    if corpus is not None:
+        return corpus
+
+    with _CORPUS_SCAN_LOCK:
+        # another request may have finished the scan while we waited
+        corpus = _cache_get("job_skills:corpus", _CORPUS_CACHE)
+        if corpus is not None:
+            return corpus
+
+        data = _fetch_all_rows(sb, "job_skills", "job_skills", chunk=1000, order_col="job_skill_id")
+        raw_counter: Counter[str] = Counter(
+            skill for record in data for skill in _split_skills_maybe_list(record.get("job_skills", ""))
+        )
+        # normalize each distinct raw skill once and carry its count over
+        # (_normalize_skill removes "building ", etc. when leading)
+        normalized_counter = _normalize_counts(raw_counter.items())
+
+        corpus = (raw_counter, normalized_counter, len(normalized_counter))
+        _cache_set("job_skills:corpus", corpus, _CORPUS_CACHE)
+        return corpus
+
+
+def _raw_skill_counts(sb, p_limit: int) -> List[Tuple[str, int]] | None:
+    """
+    Top p_limit (raw skill, count) pairs from get_skill_counts, highest first; None when the RPC is unavailable.
+    The function returns one row of parallel arrays rather than one row per skill, so PostgREST's
+    max-rows cap (1000 on Supabase) can't silently cut off the long tail.
+    """
+    agg = _rpc_rows(sb, SKILL_COUNTS_RPC, {"p_limit": p_limit})
+    if agg is None:
+        return None
+    if not agg:
+        return []
+    row = agg[0]
+    return [(name or "", int(demand or 0)) for name, demand in zip(row.get("names") or (), row.get("demands") or ())]
+
+
+def _normalized_job_skill_counts(sb, p_limit: int) -> Counter[str]:
+    """
+    Normalized job skill demand {skill: count}.
+    Preferred: Postgres tallies raw skills (get_skill_counts) and we only normalize the top p_limit of them;
+    otherwise the shared job_skills scan. Raises on scan errors; the scan counter is shared, read-only.
+    """
+    pairs = _raw_skill_counts(sb, p_limit)
+    if pairs is None:
+        return _get_job_skills_corpus(sb)[1]
+    return _normalize_counts(pairs)
 
 
 # --------------------------- Endpoints ---------------------------
@@ -393,90 +864,108 @@ def healthz():
 
 
 @router.get("/skills")
-def get_in_demand_skills(
+async def get_in_demand_skills(
     request: Request,
     limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
 ):
     """
     Return in-demand skills with normalization + fuzzy dedupe.
-    IMPORTANT: paginates through ALL job_skills rows (no 1k cap) in stable order by job_skill_id.
+    Counts come from the get_skill_counts RPC; if it is not installed we use the shared
+    job_skills scan (ALL rows, no 1k cap, stable order by job_skill_id).
     Example: [{"name": "python", "demand": 233}, ...]
     """
-    sb = _get_sb(request)
+    return await _cached_response(request, f"skills:limit={limit}", _in_demand_skills, _get_sb(request), limit)
+
+
+def _in_demand_skills(sb, limit: int) -> List[Dict[str, Any]]:
     try:
-        # stable ordered pagination by job_skill_id to ensure no dup/miss across pages
-        data = _fetch_all_rows(
-            sb,
-            "job_skills",
-            "job_skill_id, job_skills",
-            chunk=1000,
-            order_col="job_skill_id",
-        )
+        raw_freq = _normalized_job_skill_counts(sb, limit * RPC_OVERSHOOT)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching skills: {str(e)}")
 
-    raw_freq: Dict[str, int] = {}
-    for record in data:
-        for skill in _split_skills_maybe_list(record.get("job_skills", "")):
-            norm = _normalize_skill(skill)  # removes "building ", etc. when leading
-            if not norm:
-                continue
-            raw_freq[norm] = raw_freq.get(norm, 0) + 1
-
-    # Fold aliases BEFORE fuzzy dedupe so "reactjs" and "react js" funnel into "react"
-    folded = _fold_aliases_counts(raw_freq, ALIASES)
-    cleaned = _dedupe_frequency(folded, threshold=85)
+    # aliases were folded by _normalize_skill, so "reactjs" and "react js" already funnel into "react"
+    cleaned = _dedupe_frequency(raw_freq, threshold=85)
 
-    sorted_skills = sorted(cleaned.items(), key=lambda x: x[1], reverse=True)
-    return [{"name": name, "demand": demand} for name, demand in sorted_skills[:limit]]
+    top = heapq.nlargest(limit, cleaned.items(), key=_BY_COUNT)
+    return [{"name": name, "demand": demand} for name, demand in top]
 
 
-@router.get("/top-courses")
-def get_top_courses(
-    request: Request,
-    limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
-):
-    sb = _get_sb(request)
-    try:
-        records = _fetch_all_rows(
-            sb,
-            "course_alignment_scores_clean",
-            "course_title, course_code, score, calculated_at",
-            chunk=1000,
-            order_col=None,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching top courses: {str(e)}")
+def _latest_calculated_at(sb) -> str | None:
+    """
+    Newest evaluator batch timestamp in course_alignment_scores_clean (one row, not a scan).
+    Memoized with the other slow-changing reads: /top-courses, /warnings and the KPI average all
+    need it, so a dashboard load pays this round-trip once instead of three times.
+    """
+    cached = _cache_get("latest:calculated_at", _SCAN_CACHE)
+    if cached is not None:
+        return cached[0]
+    q = (
+        sb.from_("course_alignment_scores_clean")
+        .select("calculated_at")
+        .order("calculated_at", desc=True, nullsfirst=False)
+        .limit(1)
+    )
+    resp = _retry_supabase_sync(q.execute)
+    rows = resp.data or []
+    latest = rows[0].get("calculated_at") if rows else None
+    _cache_set("latest:calculated_at", (latest,), _SCAN_CACHE)  # boxed so a None timestamp is cached too
+    return latest
 
-    if not records:
-        return []
 
-    latest_batch = max((r.get("calculated_at") for r in records if r.get("calculated_at")), default=None)
-    if latest_batch is None:
-        recent_records = records
-    else:
-        recent_records = [r for r in records if r.get("calculated_at") == latest_batch]
+def _latest_batch_query(sb, columns: str):
+    """ Select from course_alignment_scores_clean restricted to the latest batch (all rows if no timestamps). """
+    latest_ts = _latest_calculated_at(sb)
+    q = sb.from_("course_alignment_scores_clean").select(columns)
+    if latest_ts is not None:
+        q = q.eq("calculated_at", latest_ts)
+    return q
 
-    recent_records = recent_records[:limit]
 
+def _course_cards(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return [
         {
             "courseName": r.get("course_title") or "Unknown Course",
             "courseCode": r.get("course_code") or "N/A",
             "matchPercentage": r.get("score") or 0,
         }
-        for r in recent_records
+        for r in records
     ]
 
 
+@router.get("/top-courses")
+async def get_top_courses(
+    request: Request,
+    limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
+):
+    """ Highest-scoring courses of the latest evaluator batch; filtering, ordering and limit run in SQL. """
+    return await _cached_response(request, f"top-courses:limit={limit}", _top_courses, _get_sb(request), limit)
+
+
+def _top_courses(sb, limit: int) -> List[Dict[str, Any]]:
+    try:
+        q = (
+            _latest_batch_query(sb, "course_title, course_code, score")
+            .order("score", desc=True, nullsfirst=False)
+            .limit(limit)
+        )
+        records = _retry_supabase_sync(q.execute).data or []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching top courses: {str(e)}")
+
+    return _course_cards(records)
+
+
 @router.get("/jobs")
-def get_trending_jobs(
+async def get_trending_jobs(
     request: Request,
     limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
 ):
-    sb = _get_sb(request)
+    return await _cached_response(request, f"jobs:limit={limit}", _trending_jobs, _get_sb(request), limit)
+
+
+def _trending_jobs(sb, limit: int) -> List[Dict[str, Any]]:
     try:
-        records = _fetch_all_rows(
+        records = _fetch_all_rows_cached(
             sb,
             "trending_jobs",
             "title, trending_score",
@@ -494,8 +983,67 @@ def get_trending_jobs(
     return out[:limit]
 
 
+def _course_coverage(sb) -> Tuple[frozenset[str], FuzzyBuckets]:
+    """
+    Skills the curriculum already covers (course_skills plus evaluator-matched market skills), with the
+    fuzzy length buckets built over them. Both are derived from 60s-cached scans, so the pair is cached
+    alongside them instead of being rebuilt on every /missing-skills request. Empty results are not cached.
+    """
+    coverage = _cache_get("coverage:course_skills", _SCAN_CACHE)
+    if coverage is not None:
+        return coverage
+
+    try:
+        matched_set = _get_matched_course_skills(sb)
+    except Exception:
+        matched_set = set()
+    try:
+        course_rows = _fetch_all_rows_cached(sb, "course_skills", "course_skills", chunk=1000, order_col=None)
+    except Exception:
+        course_rows = []
+
+    course_set = frozenset(_build_normalized_set(course_rows, "course_skills") | matched_set)
+    coverage = (course_set, _bucket_population(course_set))
+    if course_set:
+        _cache_set("coverage:course_skills", coverage, _SCAN_CACHE)
+    return coverage
+
+
+def _find_missing_skills(
+    course_set: frozenset[str],
+    course_buckets: FuzzyBuckets,
+    normalized_counter: Counter[str],
+    threshold: int,
+    fuzzy_threshold: int,
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """ CPU half of /missing-skills: dedupe job demand and drop skills the courses cover. Returns (missing, excluded). """
+    # same noise filter as _build_normalized_counts, fused into the dedupe pass (no filtered copy)
+    job_freq = _dedupe_frequency(normalized_counter, threshold=85, keep=_keep_normalized)
+
+    missing: list[dict[str, Any]] = []
+    excluded = 0
+    # only skills above the threshold, highest demand first; stop once `limit` gaps are found
+    above = sorted(
+        ((skill, count) for skill, count in job_freq.items() if skill and count >= threshold),
+        key=_BY_COUNT,
+        reverse=True,
+    )
+    for skill, count in above:
+        # Exclude if covered by course skills or evaluator-matched skills
+        if (skill in course_set) or _is_fuzzy_member(
+            skill, course_set, threshold=fuzzy_threshold, buckets=course_buckets
+        ):
+            excluded += 1
+            continue
+        missing.append({"name": skill, "demand": int(count)})
+        if len(missing) >= limit:
+            break
+    return missing, excluded
+
+
 @router.get("/missing-skills")
-def get_missing_skills(
+async def get_missing_skills(
     request: Request,
     min: int = Query(default=None, ge=1, description="Minimum count threshold (defaults to ~1% of job rows, min 3)"),
     latest_only: bool = Query(default=True, description="If true, only use latest evaluator batch"),
@@ -521,213 +1069,184 @@ def get_missing_skills(
             min = 1
         logging.info("[missing-skills] DEBUG mode → fuzzy=off, min=1")
 
-    # ---------------- THRESHOLD ----------------
-    try:
-        job_rows_for_threshold = _fetch_all_rows(
-            sb,
-            "job_skills",
-            "job_skill_id",
-            chunk=1000,
-            order_col="job_skill_id",
-        )
-        total_job_rows = len(job_rows_for_threshold)
-    except Exception:
-        total_job_rows = 1
+    ck = f"missing:v4:min={min}:fuzzy={fuzzy_threshold}:limit={limit}"
+    cached = _cache_get(ck)
+    if cached is not None:
+        return _conditional_response(request, cached)
+
+    # ---------------- FETCH ----------------
+    # The row count, course coverage and job demand are independent round-trips:
+    # run them concurrently on worker threads (sync client), like /kpi. A failed read degrades to empty.
+    total_job_rows, coverage, job_counts = await asyncio.gather(
+        # header-only exact count; no rows are streamed just to len() them
+        asyncio.to_thread(_count_exact, sb, "job_skills", ["job_skill_id"]),
+        asyncio.to_thread(_course_coverage, sb),
+        # every distinct skill can reach the threshold after normalization, so ask for all of them
+        asyncio.to_thread(_normalized_job_skill_counts, sb, PAGINATION_HARD_CAP),
+        return_exceptions=True,
+    )
+    degraded = any(isinstance(r, Exception) for r in (total_job_rows, coverage, job_counts))
+    if isinstance(total_job_rows, Exception):
+        total_job_rows = 0
+    if isinstance(coverage, Exception):
+        coverage = (frozenset(), {})
+    course_set, course_buckets = coverage
+    normalized_counter = Counter() if isinstance(job_counts, Exception) else job_counts
 
-    threshold = min if isinstance(min, int) else max(3, int(round((total_job_rows or 1) * 0.01)))
+    # ---------------- THRESHOLD ----------------
+    total_job_rows = total_job_rows or 1
+    threshold = min if isinstance(min, int) else max(3, int(round(total_job_rows * 0.01)))
     logging.info(f"[missing-skills] Using threshold={threshold} from {total_job_rows} job rows")
 
-    # ---------------- COURSE COVERAGE ----------------
-    try:
-        matched_set = _get_matched_course_skills(sb)
-    except Exception:
-        matched_set = set()
-
-    try:
-        course_rows = _fetch_all_rows(sb, "course_skills", "course_skills", chunk=1000, order_col=None)
-    except Exception:
-        course_rows = []
-
-    course_set = _build_normalized_set(course_rows, "course_skills")
-    course_set = _fold_aliases_set(course_set, ALIASES)
-    if matched_set:
-        course_set |= matched_set  # merge evaluator coverage
-
-    # ---------------- JOB DEMAND ----------------
-    try:
-        job_rows = _fetch_all_rows(sb, "job_skills", "job_skills", chunk=1000, order_col="job_skill_id")
-    except Exception:
-        job_rows = []
-
-    job_freq = _build_normalized_counts(job_rows, "job_skills")
-    job_freq = _fold_aliases_counts(job_freq, ALIASES)
-    job_freq = _dedupe_frequency(job_freq, threshold=85)
-
     # ---------------- GAP DETECTION ----------------
-    missing: list[dict[str, Any]] = []
-    excluded = 0
-    for skill, count in sorted(job_freq.items(), key=lambda x: x[1], reverse=True):
-        if count < threshold:
-            continue
-        if not skill:
-            continue
-        # Exclude if covered by course skills or evaluator-matched skills
-        if (skill in course_set) or _is_fuzzy_member(skill, course_set, threshold=fuzzy_threshold):
-            excluded += 1
-            continue
-        missing.append({"name": skill, "demand": int(count)})
-
-    # ---------------- SORTING & CACHE ----------------
-    missing.sort(key=lambda x: x["demand"], reverse=True)
-    missing = missing[:limit]
-    _cache_set(f"missing:v3:min={threshold}", missing)
+    # dedupe + fuzzy exclusion are CPU work; keep them off the event loop
+    missing, excluded = await asyncio.to_thread(
+        _find_missing_skills, course_set, course_buckets, normalized_counter, threshold, fuzzy_threshold, limit
+    )
 
     logging.info(
         f"[missing-skills] Final gap list: {len(missing)} missing skills "
         f"(excluded {excluded}, threshold={threshold})"
     )
-    return missing
+
+    # ---------------- CACHE ----------------
+    # (already sorted by demand and capped at limit); a list built from a failed read is served but not kept
+    entry = _json_entry(missing)
+    if not degraded:
+        _cache_set(ck, entry)
+    return _conditional_response(request, entry)
 
 @router.get("/warnings")
-def get_low_scoring_courses(
+async def get_low_scoring_courses(
     request: Request,
     limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
 ):
     """
     Keep behavior from your new code (latest batch), BUT restore the score <= 50 filter.
+    Latest-batch filter, score filter and ascending sort all run in SQL.
     """
-    sb = _get_sb(request)
+    return await _cached_response(request, f"warnings:limit={limit}", _low_scoring_courses, _get_sb(request), limit)
+
+
+def _low_scoring_courses(sb, limit: int) -> List[Dict[str, Any]]:
     try:
-        records = _fetch_all_rows(
-            sb,
-            "course_alignment_scores_clean",
-            "course_title, course_code, score, calculated_at",
-            chunk=1000,
-            order_col=None,
+        q = (
+            _latest_batch_query(sb, "course_title, course_code, score")
+            .lte("score", 50)
+            .order("score", desc=False)
+            .limit(limit)
         )
+        low = _retry_supabase_sync(q.execute).data or []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching warnings: {str(e)}")
 
-    if not records:
-        return []
-
-    latest_batch = max((r.get("calculated_at") for r in records if r.get("calculated_at")), default=None)
-    if latest_batch is None:
-        recent = records
-    else:
-        recent = [r for r in records if r.get("calculated_at") == latest_batch]
-
-    # RESTORE the low-score filter and sort ascending by score
-    low = [r for r in recent if (r.get("score") is not None and r.get("score") <= 50)]
-    low.sort(key=lambda r: r.get("score", 999999))
-
-    low = low[:limit]
-
-    return [
-        {
-            "courseName": r.get("course_title") or "Unknown Course",
-            "courseCode": r.get("course_code") or "N/A",
-            "matchPercentage": r.get("score") or 0,
-        }
-        for r in low
-    ]
+    return _course_cards(low)
 
 
 def _count_exact(sb, table: str, id_candidates: list[str] | None = None) -> int:
     """
-    Robust row count that works across supabase-py versions without HEAD.
+    Exact row count from a HEAD request: PostgREST answers with the Content-Range header only, no body.
     Tries a list of id columns; falls back to '*' selection.
     """
     id_candidates = id_candidates or ["id"]
     for col in id_candidates:
         try:
-            r = _retry_supabase_sync(
-                lambda: sb.from_(table).select(col, count="exact").range(0, 0).execute()
-            )
+            r = _retry_supabase_sync(sb.from_(table).select(col, count="exact", head=True).execute)
             c = int(getattr(r, "count", 0) or 0)
             return c
         except Exception:
             continue
     try:
-        r = _retry_supabase_sync(
-            lambda: sb.from_(table).select("*", count="exact").range(0, 0).execute()
-        )
+        r = _retry_supabase_sync(sb.from_(table).select("*", count="exact", head=True).execute)
         return int(getattr(r, "count", 0) or 0)
     except Exception:
         return 0
 
 
-@router.get("/kpi")
-def get_kpi_data(request: Request):
-    # short cache to collapse dashboard spikes
-    ck = "kpi:v1"
-    cached = _cache_get(ck, ttl=60)
-    if cached is not None:
-        return cached
-
-    sb = _get_sb(request)
-
-    # ----- totals (robust, with fallback table for jobs) -----
+def _kpi_jobs_total(sb) -> int:
     # Your jobs table uses job_id (text). Try that first.
     jobs_total = _count_exact(sb, "jobs", id_candidates=["job_id", "id", "uid"])
     if jobs_total == 0:
         # fallback to job_skills if jobs table has perms/schema issues
         jobs_total = _count_exact(sb, "job_skills", id_candidates=["job_skill_id", "id", "job_id"])
+    return jobs_total
 
+
+def _kpi_subjects_total(sb) -> int:
     try:
-        subjects_total = _count_exact(sb, "course_alignment_scores_clean", id_candidates=["id"])
+        return _count_exact(sb, "course_alignment_scores_clean", id_candidates=["id"])
     except Exception:
-        subjects_total = 0
+        return 0
 
-    # ----- average alignment (robust) -----
-    avg_score = 0.0
+
+def _kpi_average_score(sb) -> float:
+    # latest batch (zeros ignored), else every batch; same rule as get_kpi_summary
     try:
-        # (A) get latest ts
-        latest_row_resp = _retry_supabase_sync(
-            lambda: sb.from_("course_alignment_scores_clean")
-            .select("calculated_at")
-            .order("calculated_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        latest_ts = latest_row_resp.data[0].get("calculated_at") if (latest_row_resp and latest_row_resp.data) else None
+        latest_ts = _latest_calculated_at(sb)
+    except Exception as e:
+        logging.warning(f"[kpi] latest calculated_at failed: {e!r}; averaging every batch")
+        latest_ts = None
+    avg_score = get_average_alignment_score_local(sb, latest_ts) if latest_ts else 0.0
+    if not avg_score:  # covers 0.0 and None
+        avg_score = get_average_alignment_score_local(sb)
+    return avg_score
+
+
+def _kpi_summary(sb) -> Dict[str, Any] | None:
+    """ All four KPIs from one get_kpi_summary row, or None when the RPC is unavailable. """
+    summary = _rpc_rows(sb, KPI_SUMMARY_RPC)
+    if not summary:
+        return None
+    row = summary[0]
+    return {
+        "averageAlignmentScore": round(float(row.get("avg_score") or 0), 2),
+        "totalSubjectsAnalyzed": int(row.get("subjects_total") or 0),
+        "totalJobPostsAnalyzed": int(row.get("jobs_total") or 0),
+        "skillsExtracted": _count_normalized(row.get("skills") or ()),
+    }
 
-        # (B) aggregate, ignoring score = 0
-        sel = "coalesce(avg(NULLIF(score, 0))::float8, 0) as avg"
-        if latest_ts:
-            avg_resp = _retry_supabase_sync(
-                lambda: sb.from_("course_alignment_scores_clean").select(sel).eq("calculated_at", latest_ts).execute()
-            )
-        else:
-            avg_resp = _retry_supabase_sync(lambda: sb.from_("course_alignment_scores_clean").select(sel).execute())
 
-        if avg_resp and avg_resp.data and len(avg_resp.data) > 0:
-            avg_val = avg_resp.data[0].get("avg", 0)
-            avg_score = round(float(avg_val), 2)
+def _count_normalized(raw_skills: Iterable[str]) -> int:
+    """ Number of distinct non-empty _normalize_skill values, i.e. the scan's unique_skill_count. """
+    return len(set(filter(None, map(_normalize_skill, raw_skills))))
 
-        if not avg_score:  # covers 0.0 and None
-            avg_score = get_average_alignment_score_local(sb)
-    except Exception as e:
-        logging.warning(f"[kpi] avg(score) failed: {e!r}")
-        try:
-            avg_score = get_average_alignment_score_local(sb)
-        except Exception as e2:
-            logging.warning(f"[kpi] local average fallback failed: {e2!r}")
-            avg_score = 0.0
 
-    # ----- skills extracted (stable ordered scan) -----
-    skills_extracted = 0
+def _kpi_skills_extracted(sb) -> int:
+    # distinct raw tokens from the RPC (normalized here, so aliases/plurals merge like the scan), else the scan
+    agg = _rpc_rows(sb, DISTINCT_SKILLS_RPC)
+    if agg:
+        return _count_normalized(agg[0].get("skills") or ())
     try:
-        job_rows = _fetch_all_rows(sb, "job_skills", "job_skill_id, job_skills", chunk=1000, order_col="job_skill_id")
-        uniq = set()
-        for r in job_rows:
-            for s in _split_skills_maybe_list(r.get("job_skills", "")):
-                norm = _normalize_skill(s)
-                if norm:
-                    uniq.add(norm)
-        skills_extracted = len(uniq)
+        return _get_job_skills_corpus(sb)[2]
     except Exception:
-        pass
+        return 0
+
+
+@router.get("/kpi")
+async def get_kpi_data(request: Request):
+    # short cache to collapse dashboard spikes; entries are pre-encoded (body, etag) pairs
+    ck = "kpi:v1"
+    cached = _cache_get(ck, _KPI_CACHE)
+    if cached is not None:
+        return _conditional_response(request, cached)
+
+    sb = _get_sb(request)
+
+    # Preferred: one RPC row computed next to the data
+    result = await asyncio.to_thread(_kpi_summary, sb)
+    if result is not None:
+        entry = _json_entry(result)
+        _cache_set(ck, entry, _KPI_CACHE)
+        return _conditional_response(request, entry)
+
+    # The four KPIs are independent round-trips: run them concurrently on worker threads
+    # (the supabase client is sync) so wall time is the slowest one, not the sum.
+    jobs_total, subjects_total, avg_score, skills_extracted = await asyncio.gather(
+        asyncio.to_thread(_kpi_jobs_total, sb),
+        asyncio.to_thread(_kpi_subjects_total, sb),
+        asyncio.to_thread(_kpi_average_score, sb),
+        asyncio.to_thread(_kpi_skills_extracted, sb),
+    )
 
     result = {
         "averageAlignmentScore": avg_score,
@@ -735,12 +1254,13 @@ def get_kpi_data(request: Request):
         "totalJobPostsAnalyzed": jobs_total,
         "skillsExtracted": skills_extracted,
     }
-    _cache_set(ck, result)
-    return result
+    entry = _json_entry(result)
+    _cache_set(ck, entry, _KPI_CACHE)
+    return _conditional_response(request, entry)
 
 
 @router.get("/raw-skills-count")
-def get_raw_skills(
+async def get_raw_skills(
     request: Request,
     limit: int = Query(DEFAULT_LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
 ):
@@ -748,22 +1268,18 @@ def get_raw_skills(
     Returns a raw, non-normalized count of skills directly from job_skills, over ALL rows.
     Example: [{"name": "Python", "count": 233}, {"name": "JavaScript", "count": 150}]
     """
-    sb = _get_sb(request)
+    return await _cached_response(request, f"raw-skills:limit={limit}", _raw_skills, _get_sb(request), limit)
+
+
+def _raw_skills(sb, limit: int) -> List[Dict[str, Any]]:
+    # same split/lower/trim as the shared scan below, so the RPC output is already "raw"
+    pairs = _raw_skill_counts(sb, limit)
+    if pairs is not None:
+        return [{"name": name, "count": count} for name, count in pairs]
+
     try:
-        data = _fetch_all_rows(
-            sb,
-            "job_skills",
-            "job_skill_id, job_skills",
-            chunk=1000,
-            order_col="job_skill_id",
-        )
+        raw_freq, _, _ = _get_job_skills_corpus(sb)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching raw skills: {str(e)}")
 
-    raw_freq: Dict[str, int] = {}
-    for record in data:
-        for skill in _split_skills_maybe_list(record.get("job_skills", "")):
-            raw_freq[skill] = raw_freq.get(skill, 0) + 1
-
-    sorted_skills = sorted(raw_freq.items(), key=lambda x: x[1], reverse=True)
-    return [{"name": name, "count": int(count)} for name, count in sorted_skills[:limit]]
+    return [{"name": name, "count": int(count)} for name, count in raw_freq.most_common(limit)]
@@ -7,27 +7,56 @@ import traceback
 import uuid
 import asyncio
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Literal, List  # <-- added List
 from enum import Enum
-from fastapi import APIRouter, BackgroundTasks, Request, HTTPException, Path, Body, Query
+from fastapi import APIRouter, Request, HTTPException, Path, Body, Query
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel, Field
 
+# faster SSE payload encoding (optional with fallback); both produce compact UTF-8 JSON bytes
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except Exception:
+    def _dumps(event: Any) -> bytes:
+        return json.dumps(event, separators=(",", ":"), ensure_ascii=False).encode()
+
 # pub/sub helpers
-from ...core.event_bus import publish, subscribe, unsubscribe, get_status
+from ...core.event_bus import Subscription, publish, subscribe, unsubscribe, get_status
 # pipeline service (scraping, extraction, evaluation, pdf)
 from ...services import orchestrator as pipeline_service
 # NEW: import the final check
 from ...services.final_checking import run_final_checks
+# dashboard caches go stale once a run rewrites skills/scores
+from .dashboard import clear_caches as clear_dashboard_caches
 
 # ------------------------------------------------------------
 # Router w/ prefix so paths are /api/orchestrator/*
 # ------------------------------------------------------------
 router = APIRouter(prefix="/orchestrator", tags=["Orchestrator"])
 
-_last_report_url: Dict[str, str] = {}
+REPORT_URL_MAX_JOBS = 1024  # most recent jobs whose report URL /status can still return
+_last_report_url: OrderedDict[str, str] = OrderedDict()
 cancelled_jobs: set[str] = set()
+_job_tasks: Dict[str, asyncio.Task] = {}  # running/queued pipeline tasks, so /cancel can interrupt a step
+
+# Pipelines are heavy (scraping, model inference, PDF rendering): at most this many run at once,
+# later ones wait for a free slot instead of piling onto the same process. A cancelled job frees its
+# slot right away, but a step already handed to a worker thread runs to completion, so briefly after
+# a cancel more than this many pipelines' worth of work can be in flight.
+MAX_PIPELINE_JOBS = int(os.getenv("MAX_PIPELINE_JOBS", "4"))
+_job_slots = asyncio.Semaphore(MAX_PIPELINE_JOBS)
+
+SSE_HEARTBEAT_S = 15.0
+_HEARTBEAT = object()  # queued by _heartbeat; never published on the event bus
+
+# Pre-encoded SSE frames (the stream yields bytes, so Starlette sends them without re-encoding)
+_SSE_PREAMBLE = b":" + (b" " * 2048) + b"\n\n" + b"event: ping\ndata: connected\n\n"  # padding defeats some proxies
+_SSE_KEEPALIVE = b": keep-alive\n\n"
 
 # ------------------------------------------------------------
 # Helpers
@@ -35,27 +64,110 @@ cancelled_jobs: set[str] = set()
 def _ts() -> str:
     return datetime.now(timezone.utc).isoformat()
 
+def _set_report_url(job_id: str, url: str) -> None:
+    """Remember a job's report URL, evicting the least recently set once REPORT_URL_MAX_JOBS is exceeded."""
+    _last_report_url[job_id] = url
+    _last_report_url.move_to_end(job_id)
+    while len(_last_report_url) > REPORT_URL_MAX_JOBS:
+        _last_report_url.popitem(last=False)
+
 def _emit(job_id: str, fn: str, status: str, report_url: Optional[str] = None) -> None:
     event: Dict[str, Any] = {"function": fn, "status": status, "timestamp": _ts()}
     if report_url:
         event["reportUrl"] = report_url
-        _last_report_url[job_id] = report_url
+        _set_report_url(job_id, report_url)
     logging.info(
         f"[_emit] Publishing: Job={job_id}, Function={fn}, Status={status}, ReportUrl={report_url or 'N/A'}"
     )
     publish(job_id, event)
 
+def _emit_many(job_id: str, steps: List[tuple[str, str]]) -> None:
+    """Publish sibling step transitions as one {"batch": [...]} event (one queue put / SSE frame per subscriber)."""
+    ts = _ts()
+    batch = [{"function": fn, "status": status, "timestamp": ts} for fn, status in steps]
+    logging.info(f"[_emit_many] Publishing: Job={job_id}, Steps={steps}")
+    publish(job_id, {"batch": batch})
+
+def _is_terminal(event: Any) -> bool:
+    """True once an SSE stream has delivered its last event (error, cancellation, or the PDF step finishing)."""
+    if not isinstance(event, dict):
+        return False
+    if event.get("type") == "error":
+        return True
+    for e in event.get("batch") or (event,):
+        st = e.get("status")
+        if e.get("function") == "generate_pdf_report" and st in {"completed", "error", "cancelled"}:
+            return True
+        if st == "cancelled":
+            return True
+    return False
+
+# Step groups in run order (the two extract steps always change together)
+_PIPELINE_STEPS: tuple[tuple[str, ...], ...] = (
+    ("ingest_courses_from_pdf",),
+    ("scrape_jobs_from_google_jobs",),
+    ("extract_skills_from_jobs", "extract_subject_skills_from_supabase"),
+    ("retrain_ml_models",),
+    ("compute_subject_scores_and_save",),
+    ("final_checking",),
+    ("generate_pdf_report",),
+)
+
+def _next_steps(job_id: str, source: str) -> tuple[str, ...]:
+    """The first step group this job hasn't reported yet, i.e. the one a cancel between steps stops."""
+    seen = get_status(job_id)
+    for group in _PIPELINE_STEPS:
+        if group[0] == "ingest_courses_from_pdf" and source != "pdf":
+            continue
+        if group[0] not in seen:
+            return group
+    return ()
+
 async def _yield_now() -> None:
     await asyncio.sleep(0)
 
+async def _heartbeat(sub: Subscription, interval: float) -> None:
+    """Wake an SSE stream every `interval` seconds so it can send a keep-alive and notice disconnects."""
+    while True:
+        await asyncio.sleep(interval)
+        sub.push(_HEARTBEAT)
+
+_TRUE_STRINGS = frozenset({"1", "true", "yes", "on"})
+
+def _parse_env_bool(raw: Optional[str]) -> Optional[bool]:
+    return None if raw is None else raw.strip().lower() in _TRUE_STRINGS
+
+# Env fallbacks for the per-job flags, read once at import (None = unset, use the call-site default)
+_ENV_FLAGS: Dict[str, Optional[bool]] = {
+    key: _parse_env_bool(os.getenv(key))
+    for key in ("SCRAPE_ENABLED", "EXTRACT_ENABLED", "RETRAIN_MODELS", "GENERATE_PDF")
+}
+
 def _bool_from(payload: Dict[str, Any], payload_key: str, env_key: str, default: bool) -> bool:
     """Resolve a boolean flag with per-request override and env fallback (no env mutation)."""
     if payload_key in payload:
         return bool(payload[payload_key])
-    raw = os.getenv(env_key)
-    if raw is None:
-        return default
-    return raw.strip().lower() in {"1", "true", "yes", "on"}
+    env = _ENV_FLAGS[env_key] if env_key in _ENV_FLAGS else _parse_env_bool(os.getenv(env_key))
+    return default if env is None else env
+
+@dataclass(frozen=True, slots=True)
+class PipelineFlags:
+    """Per-job stage switches, resolved once when the job starts and passed to the pipeline steps."""
+    scrape: bool
+    extract: bool
+    retrain: bool
+    pdf: bool
+    use_stored_data: bool
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "PipelineFlags":
+        return cls(
+            scrape=_bool_from(payload, "scrapeEnabled", "SCRAPE_ENABLED", True),
+            extract=_bool_from(payload, "extractEnabled", "EXTRACT_ENABLED", True),
+            retrain=_bool_from(payload, "retrainModels", "RETRAIN_MODELS", False),
+            pdf=_bool_from(payload, "generatePdf", "GENERATE_PDF", True),
+            use_stored_data=str(payload.get("source", "fresh")).lower() == "stored",
+        )
 
 async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
     """
@@ -64,20 +176,12 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
     """
     logging.info(f"[Background Job] Started for jobId: {job_id} with payload: {payload}")
     source = str(payload.get("source", "fresh")).lower()
-    use_stored_data = (source == "stored")
-
-    # Per-job flags
-    scrape_enabled = _bool_from(payload, "scrapeEnabled", "SCRAPE_ENABLED", True)
-    extract_enabled = _bool_from(payload, "extractEnabled", "EXTRACT_ENABLED", True)
-    retrain_models  = _bool_from(payload, "retrainModels",  "RETRAIN_MODELS",  False)
-    generate_pdf    = _bool_from(payload, "generatePdf",    "GENERATE_PDF",    True)
-
-    logging.debug(
-        f"[Background Job] Effective flags: "
-        f"Scrape={scrape_enabled}, Extract={extract_enabled}, Retrain={retrain_models}, PDF={generate_pdf}, "
-        f"UseStoredData={use_stored_data}"
-    )
 
+    # Per-job flags (this job's own copy; nothing process-wide is read or written after this)
+    flags = PipelineFlags.from_payload(payload)
+    logging.debug(f"[Background Job] Effective flags: {flags}")
+
+    running: List[str] = []  # step(s) in flight, reported as cancelled if the task is cancelled mid-step
     try:
         # STEP 0: (NEW) Ingest Courses from PDF if requested
         if source == "pdf":
@@ -85,38 +189,44 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
                 _emit(job_id, "ingest_courses_from_pdf", "cancelled")
                 return
             _emit(job_id, "ingest_courses_from_pdf", "started")
+            running = ["ingest_courses_from_pdf"]
+            await _yield_now()
+            # Accept list of paths/globs from payload; default empty list
+            pdf_paths: List[str] = payload.get("pdfPaths") or []
+            await pipeline_service.ingest_courses_from_pdf_paths(pdf_paths)
+            # only on success: a cancelled ingest stays in `running` and is reported as cancelled below
+            _emit(job_id, "ingest_courses_from_pdf", "completed")
+            running = []
             await _yield_now()
-            try:
-                # Accept list of paths/globs from payload; default empty list
-                pdf_paths: List[str] = payload.get("pdfPaths") or []
-                await pipeline_service.ingest_courses_from_pdf_paths(pdf_paths)
-            finally:
-                _emit(job_id, "ingest_courses_from_pdf", "completed")
-                await _yield_now()
 
         # STEP 1: SCRAPE
         if job_id in cancelled_jobs:
             _emit(job_id, "scrape_jobs_from_google_jobs", "cancelled")
             return
         _emit(job_id, "scrape_jobs_from_google_jobs", "started")
+        running = ["scrape_jobs_from_google_jobs"]
         await _yield_now()
-        await pipeline_service.scrape_and_ingest(scrape_enabled=scrape_enabled)
+        await pipeline_service.scrape_and_ingest(scrape_enabled=flags.scrape)
         _emit(job_id, "scrape_jobs_from_google_jobs", "completed")
+        running = []
         await _yield_now()
 
         # STEP 2: EXTRACT SKILLS
         if job_id in cancelled_jobs:
-            _emit(job_id, "extract_skills_from_jobs", "cancelled")
-            _emit(job_id, "extract_subject_skills_from_supabase", "cancelled")
+            _emit_many(job_id, [("extract_skills_from_jobs", "cancelled"),
+                                ("extract_subject_skills_from_supabase", "cancelled")])
             return
-        _emit(job_id, "extract_skills_from_jobs", "started")
-        _emit(job_id, "extract_subject_skills_from_supabase", "started")
+        _emit_many(job_id, [("extract_skills_from_jobs", "started"),
+                            ("extract_subject_skills_from_supabase", "started")])
+        running = ["extract_skills_from_jobs", "extract_subject_skills_from_supabase"]
         await _yield_now()
         await pipeline_service.extract_skills(
-            extract_enabled=extract_enabled, use_stored_data=use_stored_data
+            extract_enabled=flags.extract, use_stored_data=flags.use_stored_data
         )
-        _emit(job_id, "extract_skills_from_jobs", "completed")
-        _emit(job_id, "extract_subject_skills_from_supabase", "completed")
+        clear_dashboard_caches()
+        _emit_many(job_id, [("extract_skills_from_jobs", "completed"),
+                            ("extract_subject_skills_from_supabase", "completed")])
+        running = []
         await _yield_now()
 
         # STEP 3: RETRAIN MODELS
@@ -124,9 +234,11 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
             _emit(job_id, "retrain_ml_models", "cancelled")
             return
         _emit(job_id, "retrain_ml_models", "started")
+        running = ["retrain_ml_models"]
         await _yield_now()
-        await pipeline_service.retrain_ml_models(retrain=retrain_models)
+        await pipeline_service.retrain_ml_models(retrain=flags.retrain)
         _emit(job_id, "retrain_ml_models", "completed")
+        running = []
         await _yield_now()
 
         # STEP 4: EVALUATE COURSES
@@ -134,9 +246,12 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
             _emit(job_id, "compute_subject_scores_and_save", "cancelled")
             return
         _emit(job_id, "compute_subject_scores_and_save", "started")
+        running = ["compute_subject_scores_and_save"]
         await _yield_now()
         raw_report_data = await pipeline_service.evaluate_and_save_scores()
+        clear_dashboard_caches()
         _emit(job_id, "compute_subject_scores_and_save", "completed")
+        running = []
         await _yield_now()
 
         # STEP 4.5: FINAL CHECK (NEW)
@@ -144,9 +259,11 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
             _emit(job_id, "final_checking", "cancelled")
             return
         _emit(job_id, "final_checking", "started")
+        running = ["final_checking"]
         await _yield_now()
         validated_data = await run_final_checks(raw_report_data, strict=True)
         _emit(job_id, "final_checking", "completed")
+        running = []
         await _yield_now()
 
         # STEP 5: GENERATE PDF
@@ -154,28 +271,31 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
             _emit(job_id, "generate_pdf_report", "cancelled")
             return
         _emit(job_id, "generate_pdf_report", "started")
+        running = ["generate_pdf_report"]
         await _yield_now()
 
         pdf_info = await pipeline_service.generate_and_store_pdf_report(
-            gen_pdf=generate_pdf, report_data=validated_data
+            gen_pdf=flags.pdf, report_data=validated_data
         )
 
+        # generate_and_store_pdf_report only returns after checking the file exists and is non-empty
+        # (it raises otherwise), so there is nothing left to poll for here
         report_url: Optional[str] = None
         if pdf_info and isinstance(pdf_info, dict):
             report_url = pdf_info.get("url")
-            pdf_path = pdf_info.get("path")
-            if pdf_path:
-                for _ in range(20):  # wait ~2s max
-                    try:
-                        if os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0:
-                            break
-                    except Exception:
-                        pass
-                    await asyncio.sleep(0.1)
 
         _emit(job_id, "generate_pdf_report", "completed", report_url=report_url)
+        running = []
         await asyncio.sleep(0)
 
+    except asyncio.CancelledError:
+        # /cancel cancelled the task: stop now instead of at the next checkpoint. Between steps nothing
+        # is running, so the next step is reported instead (SSE clients need a terminal frame either way).
+        stopped = running or list(_next_steps(job_id, source))
+        logging.info(f"[Background Job] Cancelled for jobId: {job_id} (steps: {stopped})")
+        if stopped:
+            _emit_many(job_id, [(fn, "cancelled") for fn in stopped])
+        raise
     except Exception as e:
         logging.error(f"[Background Job] Error for job {job_id}: {e}", exc_info=True)
         _emit(job_id, "generate_pdf_report", "error")
@@ -194,6 +314,35 @@ async def _background_job(job_id: str, payload: Dict[str, Any]) -> None:
             cancelled_jobs.remove(job_id)
         logging.info(f"[Background Job] Finished for jobId: {job_id}")
 
+async def _guarded_run(job_id: str, payload: Dict[str, Any]) -> None:
+    """
+    Run _background_job once one of the MAX_PIPELINE_JOBS slots is free.
+    The slot is released as soon as the task is cancelled, even if the current step's worker
+    thread is still running (threads can't be interrupted), so the cap is on jobs, not threads.
+    """
+    started = False
+    try:
+        async with _job_slots:
+            started = True
+            await _background_job(job_id, payload)
+    except asyncio.CancelledError:
+        if not started:
+            # cancelled while queued: _background_job never ran, so report it and clean up here
+            logging.info(f"[Background Job] Cancelled before start for jobId: {job_id}")
+            source = str(payload.get("source", "fresh")).lower()
+            _emit_many(job_id, [(fn, "cancelled") for fn in _next_steps(job_id, source)])
+            cancelled_jobs.discard(job_id)
+        raise
+
+async def cancel_all_jobs() -> None:
+    """Cancel every running or queued pipeline job and wait for them to unwind (called on app shutdown)."""
+    tasks = list(_job_tasks.values())
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        logging.info(f"[Orchestrator] Cancelling {len(tasks)} pipeline job(s) for shutdown")
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 # ------------------------------------------------------------
 # Pydantic models for docs
 # ------------------------------------------------------------
@@ -238,6 +387,9 @@ class OrchestratorEvent(BaseModel):
     reportUrl: Optional[str] = None
     type: Optional[str] = None  # set to "error" for error envelopes
 
+class OrchestratorBatchEvent(BaseModel):
+    batch: List[OrchestratorEvent]  # sibling steps that changed together (e.g. the two extraction steps)
+
 # ------------------------------------------------------------
 # API ROUTES (now documented)
 # ------------------------------------------------------------
@@ -286,18 +438,20 @@ async def start_pipeline(
             },
         },
     ),
-    background: BackgroundTasks = None,
 ) -> StartResponse:
     if not jobId:
         raise HTTPException(status_code=400, detail="Job ID is required.")
-    background.add_task(_background_job, jobId, payload.dict())
+    # a task (not BackgroundTasks) so /cancel can interrupt the step in flight
+    task = asyncio.create_task(_guarded_run(jobId, payload.dict()))
+    _job_tasks[jobId] = task
+    task.add_done_callback(lambda t: _job_tasks.pop(jobId, None) if _job_tasks.get(jobId) is t else None)
     return StartResponse(status="started", jobId=jobId)
 
 @router.post(
     "/cancel",
     response_model=CancelResponse,
     summary="Cancel a running job",
-    description="Signals the background job to cancel as soon as possible.",
+    description="Cancels the background job, interrupting the step in flight.",
     responses={
         200: {"description": "Cancellation requested"},
         400: {"description": "Missing jobId"},
@@ -307,7 +461,10 @@ async def cancel(req: CancelReq) -> CancelResponse:
     jobId = (req.jobId or "").strip()
     if not jobId:
         raise HTTPException(status_code=400, detail="Job ID is required.")
-    cancelled_jobs.add(jobId)
+    cancelled_jobs.add(jobId)  # still honoured at checkpoints (e.g. cancel before the task starts)
+    task = _job_tasks.pop(jobId, None)
+    if task is not None:
+        task.cancel()
     return CancelResponse(status="cancelled", jobId=jobId)
 
 @router.get(
@@ -315,7 +472,8 @@ async def cancel(req: CancelReq) -> CancelResponse:
     summary="Server-Sent Events stream for a job",
     description=(
         "Opens a **text/event-stream**. Emits JSON payloads like "
-        "`{ function, status, timestamp, reportUrl? }` and closes after completion or error."
+        "`{ function, status, timestamp, reportUrl? }` (or `{ batch: [...] }` for steps that change together) "
+        "and closes after completion or error."
     ),
     responses={
         200: {
@@ -335,51 +493,41 @@ async def events(
 ):
     if not jobId:
         raise HTTPException(status_code=400, detail="Job ID is required.")
-    queue: asyncio.Queue = subscribe(jobId)
+    sub: Subscription = subscribe(jobId)
 
     async def event_stream(stream_job_id: str):
-        heartbeat = 15.0
-        loop = asyncio.get_event_loop()
-        # initial padding to defeat some proxies
-        yield ":" + (" " * 2048) + "\n\n"
-        # initial ping
-        yield "event: ping\ndata: connected\n\n"
-        last_sent = loop.time()  # ensure heartbeat timer starts after initial ping
+        # initial padding + ping
+        yield _SSE_PREAMBLE
 
+        # one timer task per stream feeds heartbeats into the same mailbox, so the loop only ever
+        # waits on the subscription's Event (no wait_for() timeout futures per iteration)
+        hb_task = asyncio.create_task(_heartbeat(sub, SSE_HEARTBEAT_S))
         try:
-            while True:
+            done = False
+            while not done:
                 if await request.is_disconnected():
                     break
 
-                timeout = max(0.0, heartbeat - (loop.time() - last_sent))
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=timeout)
-                except asyncio.TimeoutError:
-                    # heartbeat comment line
-                    yield f": keep-alive {int(loop.time())}\n\n"
-                    last_sent = loop.time()
-                    continue
-
-                payload = json.dumps(event, separators=(",", ":"))
-                yield f"data: {payload}\n\n"
-                last_sent = loop.time()
-
-                # termination conditions
-                if isinstance(event, dict):
-                    etype = event.get("type")
-                    fn = event.get("function")
-                    st = event.get("status")
-                    if etype == "error":
-                        await asyncio.sleep(0.1)
-                        break
-                    if fn == "generate_pdf_report" and st in {"completed", "error", "cancelled"}:
-                        await asyncio.sleep(0.1)
-                        break
-                    if st == "cancelled":
+                await sub.ready.wait()
+                sub.ready.clear()
+                # drain everything published since the last wake-up
+                while sub.events:
+                    event = sub.events.popleft()
+                    if event is _HEARTBEAT:
+                        # heartbeat comment line
+                        yield _SSE_KEEPALIVE
+                        continue
+
+                    yield b"data: " + _dumps(event) + b"\n\n"
+
+                    # termination conditions
+                    if _is_terminal(event):
                         await asyncio.sleep(0.1)
+                        done = True
                         break
         finally:
-            unsubscribe(jobId, queue)
+            hb_task.cancel()
+            unsubscribe(jobId, sub)
 
     headers = {
         "Cache-Control": "no-cache",
@@ -1,7 +1,8 @@
 # backend/app/api/endpoints/report_files.py
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
-from pathlib import Path, PurePath
+import re
+from pathlib import Path
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
@@ -11,26 +12,26 @@ REPORTS_DIR = (Path(__file__).resolve().parents[3] / "static" / "reports").resol
 REPORTS_DIR.mkdir(parents=True, exist_ok=True)
 print(f"[reports] Serving from: {REPORTS_DIR}")  # <- keep for one run
 
-@router.get("/{filename}")
-def download_report(filename: str):
-    if ("/" in filename) or ("\\" in filename) or (PurePath(filename).name != filename):
+# Plain "<name>.pdf" only: no separators, so no traversal and nothing to normalise
+_SAFE_NAME = re.compile(r"\A[A-Za-z0-9._-]{1,128}\.pdf\Z")
+
+def _report_path(filename: str) -> Path:
+    if not _SAFE_NAME.match(filename):
         raise HTTPException(status_code=400, detail="Invalid filename")
     file_path = (REPORTS_DIR / filename).resolve()
-    if not str(file_path).startswith(str(REPORTS_DIR)):
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    if not file_path.exists() or file_path.is_dir():
+    # the name can't escape REPORTS_DIR, but a symlink inside it could point anywhere on disk
+    if file_path.parent != REPORTS_DIR or not file_path.is_file():
         raise HTTPException(status_code=404, detail="Report not found")
+    return file_path
+
+@router.get("/{filename}")
+def download_report(filename: str):
+    file_path = _report_path(filename)
     return FileResponse(str(file_path), media_type="application/pdf", filename=filename,
                         headers={"Cache-Control": "no-store","X-Content-Type-Options":"nosniff"})
 
 # so HEAD probes don’t 405:
 @router.head("/{filename}")
 def head_report(filename: str):
-    if ("/" in filename) or ("\\" in filename) or (PurePath(filename).name != filename):
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    file_path = (REPORTS_DIR / filename).resolve()
-    if not str(file_path).startswith(str(REPORTS_DIR)):
-        raise HTTPException(status_code=400, detail="Invalid filename")
-    if not file_path.exists() or file_path.is_dir():
-        raise HTTPException(status_code=404, detail="Report not found")
+    _report_path(filename)
     return {}
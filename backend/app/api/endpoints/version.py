@@ -71,7 +71,7 @@ def _max_ts_from_table_versions(sb, tables: Iterable[str]) -> Optional[datetime]
     try:
         resp = (
             sb.table("table_versions")
-            .select("table_name, updated_at")
+            .select("updated_at")
             .in_("table_name", list(tables))
             .order("updated_at", desc=True)
             .limit(1)
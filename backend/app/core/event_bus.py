@@ -1,23 +1,45 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
 from typing import Any, Dict, List
 import logging  # used to print info/debug messages
 
-# For each job_id, it keep a list of "subscriber queues".
+# How many undelivered events a subscriber may hold; a slow client loses its oldest events first.
+SUBSCRIBER_BACKLOG = 256
+
+
+class Subscription:
+    """
+    One listener's mailbox: a bounded backlog plus an Event that is set whenever something lands in it.
+    The reader waits on `ready`, clears it, then drains `events` (no per-get futures like asyncio.Queue).
+    """
+
+    __slots__ = ("events", "ready")
+
+    def __init__(self) -> None:
+        self.events: deque[Any] = deque(maxlen=SUBSCRIBER_BACKLOG)
+        self.ready = asyncio.Event()
+
+    def push(self, event: Any) -> None:
+        self.events.append(event)
+        self.ready.set()
+
+
+# For each job_id, it keep a list of "subscriber mailboxes".
 # Think of it like each job has a mailbox, and multiple people can subscribe to get its letters.
-_queues: Dict[str, List[asyncio.Queue]] = {}
+_queues: Dict[str, List[Subscription]] = {}
 
 # This just stores the latest status of each function in the job (like "started", "completed")
 _status: Dict[str, Dict[str, str]] = {}
 
 
-def subscribe(job_id: str) -> asyncio.Queue:
+def subscribe(job_id: str) -> Subscription:
     """
     Someone wants to listen for events of a given job_id.
-    We create a new queue (like a personal mailbox) and attach it to that job.
+    We create a new Subscription (like a personal mailbox) and attach it to that job.
     """
-    q: asyncio.Queue = asyncio.Queue()
+    q = Subscription()
     _queues.setdefault(job_id, []).append(q)
     _status.setdefault(job_id, {})
     logging.info(f"[EventBus] Subscribed new client for job_id: {job_id}. Total subscribers: {len(_queues[job_id])}")
@@ -28,12 +50,16 @@ def publish(job_id: str, event: Dict[str, Any]) -> None:
     """
     Send an event to EVERY subscriber queue of this job_id.
     This is like broadcasting a message to all listeners.
+    A {"batch": [event, ...]} envelope is delivered as one message; each inner event still updates the status.
     """
     fn = event.get("function")
     st = event.get("status")
-    if fn and st:
-        # save the most recent status
-        _status.setdefault(job_id, {})[fn] = st
+    for e in event.get("batch") or (event,):
+        e_fn = e.get("function")
+        e_st = e.get("status")
+        if e_fn and e_st:
+            # save the most recent status
+            _status.setdefault(job_id, {})[e_fn] = e_st
 
     subscribers_count = len(_queues.get(job_id, []))
     logging.debug(f"[EventBus] Publishing event for job {job_id} (Fn: {fn}, Status: {st}). Attempting to push to {subscribers_count} queues.")
@@ -41,12 +67,11 @@ def publish(job_id: str, event: Dict[str, Any]) -> None:
     # go through all subscriber mailboxes and drop in the event
     for q in _queues.get(job_id, []):
         try:
-            q.put_nowait(event)  # don't wait, just push event instantly
+            if len(q.events) == SUBSCRIBER_BACKLOG:
+                # mailbox is full: the oldest undelivered event makes room for this one
+                logging.warning(f"[EventBus] Backlog for job {job_id} is full. Oldest event dropped for one subscriber.")
+            q.push(event)  # don't wait, just push event instantly
             logging.debug(f"[EventBus] Successfully put event to queue for job {job_id}.")
-        except asyncio.QueueFull:
-            # if a queue is overloaded, just drop the message
-            logging.warning(f"[EventBus] Queue for job {job_id} is full. Event dropped for one subscriber.")
-            pass
         except Exception as e:
             logging.error(f"[EventBus] Error putting event to queue for job {job_id}: {e}", exc_info=True)
 
@@ -60,7 +85,7 @@ def get_status(job_id: str) -> Dict[str, str]:
     return _status.get(job_id, {})
 
 
-def unsubscribe(job_id: str, queue: asyncio.Queue | None = None) -> None:
+def unsubscribe(job_id: str, queue: Subscription | None = None) -> None:
     """
     Stop listening to events.
     - If queue is provided → remove just that subscriber.
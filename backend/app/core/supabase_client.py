@@ -22,8 +22,8 @@ def create_supabase_client() -> Client:
 supabase: Client = create_supabase_client()
 
 def get_supabase_client() -> Client:
-    """Create a *new* client each time."""
-    return create_supabase_client()
+    """Return the shared client (its HTTP connection pool is reused across calls)."""
+    return supabase
 
 # Retry wrapper
 def supabase_query_with_retry(query_func, max_attempts=3, delay=0.2):
@@ -1,17 +1,20 @@
 # apps/backend/main.py
 
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from pathlib import Path
 import logging
 from typing import List
 
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 
 # 🔑 MODERN SDK IMPORTS
 from google import genai
@@ -31,10 +34,18 @@ logging.basicConfig(
     format="%(asctime)s %(levelname)s [main] %(message)s",
 )
 
+# Fail a hung PostgREST call after this long (supabase-py default: 120s)
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30"))
+
 # Central Gemini config
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro-latest").strip()
 
+# Worker threads for blocking work: sync endpoints (anyio's limiter, default 40) and
+# asyncio.to_thread offloads (the loop's default executor). Supabase calls are sync and
+# I/O-bound, so a burst of dashboard polls would otherwise queue behind the default caps.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "128"))
+
 def _get_service_key() -> tuple[str, str]:
     """
     Load Supabase URL and a **service** key (not anon).
@@ -64,22 +75,46 @@ def _get_service_key() -> tuple[str, str]:
     return url, key
 
 
+def _warn_duplicate_routes(app: FastAPI) -> None:
+    """
+    Log every (method, path) registered more than once, e.g. a router included twice or two modules
+    claiming one path: FastAPI would silently serve whichever was registered first.
+    """
+    seen: set[tuple[str, str]] = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (method, getattr(route, "path", ""))
+            if key in seen:
+                logging.warning("[routes] duplicate route registered: %s %s", *key)
+            seen.add(key)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logging.info("Application startup…")
+    _warn_duplicate_routes(app)
+
+    # --- Thread pools for sync handlers / to_thread offloads ---
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREADPOOL_SIZE, thread_name_prefix="worker")
+    )
+    logging.info("Worker thread pools sized to %s", THREADPOOL_SIZE)
 
     # --- Supabase client attach ---
     url, key = _get_service_key()
-    sb: Client = create_client(url, key)
+    # Built once per process; every request reuses it (and its keep-alive HTTP pool) via app.state
+    sb: Client = create_client(
+        url, key, options=ClientOptions(schema="public", postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT)
+    )
     app.state.supabase = sb
     logging.info("Supabase service client attached to app.state.supabase")
 
-    # Quick probe: tiny exact count to confirm RLS/keys are correct.
+    # Quick probe: header-only exact count (HEAD, no rows) to confirm RLS/keys are correct.
     try:
         resp = (
             sb.from_("course_alignment_scores_clean")
-            .select("course_alignment_score_clean_id", count="exact")
-            .range(0, 0)
+            .select("course_alignment_score_clean_id", count="exact", head=True)
             .execute()
         )
         cnt = int(getattr(resp, "count", 0) or 0)
@@ -109,6 +144,8 @@ async def lifespan(app: FastAPI):
             )
 
     yield
+    # don't leave pipeline jobs running against a process that is going away
+    await orchestrator.cancel_all_jobs()
     logging.info("Application shutdown.")
 
 
@@ -195,7 +232,7 @@ def healthz():
         raise HTTPException(status_code=500, detail="Supabase client missing")
 
     try:
-        resp = sb.from_("jobs").select("job_id", count="exact").range(0, 0).execute()
+        resp = sb.from_("jobs").select("job_id", count="exact", head=True).execute()
         jobs = int(getattr(resp, "count", 0) or 0)
     except Exception as e:
         logging.warning("[healthz] jobs count failed: %r", e)
@@ -258,4 +295,4 @@ app.include_router(version.router,            prefix="/api/dashboard", tags=["Da
 app.include_router(pipeline.router,           prefix="/api/pipeline",  tags=["Pipeline"])
 app.include_router(orchestrator.router,       prefix="/api",           tags=["Orchestrator"])
 app.include_router(report_files.router,       prefix="/api",           tags=["Reports"])
-app.include_router(scan_pdf_endpoint.router,  prefix="/api",           tags=["Scan PDF"])
\ No newline at end of file
+app.include_router(scan_pdf_endpoint.router,  prefix="/api",           tags=["Scan PDF"])
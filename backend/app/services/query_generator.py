@@ -16,23 +16,16 @@ from google import genai
 from google.genai import types 
 
 from serpapi import GoogleSearch
-from supabase import create_client, Client
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-# Initialize Supabase Client
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-except Exception as e:
-    print(f"❌ Failed to initialize Supabase client: {e}")
-    # You might want to mock or fail hard here in a real application
+# Shared Supabase client (one connection pool per process)
+from ..core.supabase_client import supabase
 
 # Suppress sklearn warning
 warnings.filterwarnings("ignore", category=UserWarning)
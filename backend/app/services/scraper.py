@@ -6,19 +6,15 @@ from data.course_descriptions import COURSE_DESCRIPTIONS  # (not used here yet,
 from .query_generator import get_top_keywords  # gets trending/important keywords to search jobs with
 from .query_logger import log_query            # saves some metadata about each search
 from ..core.supabase_client import insert_multiple_jobs  # bulk insert jobs to Supabase
+from ..core.supabase_client import supabase              # shared client (so we can store jobs / read keywords)
 from .update_cs_keywords import update_cs_keywords       # refresh CS keywords list in DB
 from .trending_jobs import compute_trending_jobs         # compute trending job titles after scraping
 
-from supabase import create_client, Client
 import os
 
 # load environment variables from .env (keys, URLs, etc.)
 load_dotenv()
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY")
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-# connect to Supabase (so we can store jobs / read keywords)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # we only keep results that seem to come from these sources
 TARGET_SOURCES = ["jobstreet", "indeed", "linkedin", "glassdoor"]
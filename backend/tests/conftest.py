@@ -0,0 +1,23 @@
+"""
+Make the backend modules importable without running the `app` package __init__ chain
+(which imports every router, the evaluator's ML stack and a live Supabase client).
+Each package is registered as an empty shell pointing at its real directory, so
+`import app.api.endpoints.dashboard` loads just that module and its own imports.
+"""
+import sys
+import types
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+
+for _name, _sub in (
+    ("app", ""),
+    ("app.api", "api"),
+    ("app.api.endpoints", "api/endpoints"),
+    ("app.core", "core"),
+    ("app.services", "services"),
+):
+    if _name not in sys.modules:
+        _pkg = types.ModuleType(_name)
+        _pkg.__path__ = [str(APP_DIR / _sub)]
+        sys.modules[_name] = _pkg
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from starlette.requests import Request
+
+from app.api.endpoints import dashboard
+from app.api.endpoints.dashboard import _conditional_response, _dedupe_frequency, _json_entry, _normalize_skill
+
+
+def _request(if_none_match=None):
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+# --------------------------- _dedupe_frequency ---------------------------
+
+def _pairwise_dedupe(freq, threshold=85):
+    """ The plain greedy walk the block-wise version must reproduce: highest count first, first matching rep wins. """
+    fuzz = dashboard._rf_fuzz
+    merged = {}
+    for skill, count in sorted(freq.items(), key=lambda kv: kv[1], reverse=True):
+        norm = _normalize_skill(skill)
+        if not norm:
+            continue
+        for rep in merged:
+            if fuzz.partial_ratio(norm, rep) >= threshold:
+                merged[rep] += count
+                break
+        else:
+            merged[norm] = count
+    return merged
+
+
+def test_dedupe_merges_into_highest_count_representative():
+    freq = {"python": 10, "python programming": 3, "reactjs": 2, "react": 6, "sql": 4}
+    assert _dedupe_frequency(freq) == {"python": 13, "react": 8, "sql": 4}
+
+
+def test_dedupe_keep_filter_and_empty_input():
+    assert _dedupe_frequency({}) == {}
+    assert _dedupe_frequency({"python": 3, "docker": 2}, keep=lambda s: s != "docker") == {"python": 3}
+
+
+@pytest.mark.skipif(dashboard._rf_process is None, reason="rapidfuzz not installed")
+@pytest.mark.parametrize("block_rows", [3, 256])
+def test_dedupe_blocks_match_pairwise_walk(monkeypatch, block_rows):
+    monkeypatch.setattr(dashboard, "FUZZY_BLOCK_ROWS", block_rows)
+    rng = random.Random(7)
+    stems = ["python", "java", "docker", "kubernetes", "sql", "react", "machine learning", "aws", "linux"]
+    freq = {}
+    for _ in range(80):
+        skill = rng.choice(stems) + rng.choice(["", " developer", " basics", "s", " 3", " cloud"])
+        freq[skill] = rng.randint(1, 50)
+    assert _dedupe_frequency(freq) == _pairwise_dedupe(freq)
+
+
+# --------------------------- ETag / 304 ---------------------------
+
+def test_conditional_response_serves_body_with_etag():
+    body, etag = entry = _json_entry([{"name": "python", "demand": 3}])
+    resp = _conditional_response(_request(), entry)
+    assert resp.status_code == 200
+    assert resp.body == body
+    assert resp.headers["etag"] == etag
+    assert etag.startswith('W/"')
+
+
+def test_conditional_response_304_on_matching_if_none_match():
+    _, etag = entry = _json_entry({"ok": True})
+    resp = _conditional_response(_request(f'W/"stale", {etag}'), entry)
+    assert resp.status_code == 304
+    assert resp.body == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_conditional_response_200_on_stale_etag():
+    entry = _json_entry({"ok": True})
+    stale = _json_entry({"ok": False})[1]
+    assert _conditional_response(_request(stale), entry).status_code == 200
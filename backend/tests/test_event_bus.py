@@ -0,0 +1,48 @@
+import uuid
+
+from app.core import event_bus
+from app.core.event_bus import SUBSCRIBER_BACKLOG, get_status, publish, subscribe, unsubscribe
+
+
+def _job_id():
+    return f"test-{uuid.uuid4()}"
+
+
+def test_publish_fans_out_and_records_status():
+    job = _job_id()
+    a, b = subscribe(job), subscribe(job)
+    event = {"function": "scrape_jobs_from_google_jobs", "status": "started"}
+    publish(job, event)
+    assert list(a.events) == [event] and list(b.events) == [event]
+    assert a.ready.is_set() and b.ready.is_set()
+    assert get_status(job) == {"scrape_jobs_from_google_jobs": "started"}
+    unsubscribe(job, a)
+    unsubscribe(job, b)
+    assert job not in event_bus._queues
+
+
+def test_batch_is_one_message_but_updates_every_status():
+    job = _job_id()
+    sub = subscribe(job)
+    batch = {"batch": [
+        {"function": "extract_skills_from_jobs", "status": "completed"},
+        {"function": "extract_subject_skills_from_supabase", "status": "completed"},
+    ]}
+    publish(job, batch)
+    assert list(sub.events) == [batch]
+    assert get_status(job) == {
+        "extract_skills_from_jobs": "completed",
+        "extract_subject_skills_from_supabase": "completed",
+    }
+    unsubscribe(job, sub)
+
+
+def test_full_backlog_drops_oldest_events():
+    job = _job_id()
+    sub = subscribe(job)
+    for i in range(SUBSCRIBER_BACKLOG + 5):
+        publish(job, {"function": "step", "status": "started", "n": i})
+    assert len(sub.events) == SUBSCRIBER_BACKLOG
+    assert sub.events[0]["n"] == 5
+    assert sub.events[-1]["n"] == SUBSCRIBER_BACKLOG + 4
+    unsubscribe(job, sub)
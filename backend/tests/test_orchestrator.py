@@ -0,0 +1,159 @@
+import asyncio
+import sys
+import types
+import uuid
+
+import pytest
+
+
+class FakePipeline(types.ModuleType):
+    """
+    Stand-in for app.services.orchestrator: every step returns at once unless a test
+    swaps in its own coroutine (e.g. one that blocks until cancelled).
+    """
+
+    STEPS = (
+        "ingest_courses_from_pdf_paths",
+        "scrape_and_ingest",
+        "extract_skills",
+        "retrain_ml_models",
+        "evaluate_and_save_scores",
+        "generate_and_store_pdf_report",
+    )
+
+    def __init__(self):
+        super().__init__("app.services.orchestrator")
+        self.reset()
+
+    def reset(self):
+        for name in self.STEPS:
+            setattr(self, name, self._instant)
+
+    @staticmethod
+    async def _instant(*args, **kwargs):
+        return {}
+
+
+async def _passthrough_checks(data, strict=True):
+    return data
+
+
+pipeline_service = FakePipeline()
+final_checking = types.ModuleType("app.services.final_checking")
+final_checking.run_final_checks = _passthrough_checks
+sys.modules[pipeline_service.__name__] = pipeline_service
+sys.modules[final_checking.__name__] = final_checking
+
+from app.api.endpoints import orchestrator  # noqa: E402
+from app.core.event_bus import get_status, subscribe, unsubscribe  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_pipeline(monkeypatch):
+    pipeline_service.reset()
+    # one slot, bound to this test's event loop
+    monkeypatch.setattr(orchestrator, "_job_slots", asyncio.Semaphore(1))
+    yield
+    orchestrator._job_tasks.clear()
+
+
+async def _block_forever(*args, **kwargs):
+    await asyncio.Event().wait()
+
+
+def _start(payload):
+    job = f"test-{uuid.uuid4()}"
+    task = asyncio.create_task(orchestrator._guarded_run(job, payload))
+    orchestrator._job_tasks[job] = task
+    return job, task
+
+
+async def _cancel(job):
+    await orchestrator.cancel(orchestrator.CancelReq(jobId=job))
+
+
+def _drain(sub):
+    events = list(sub.events)
+    sub.events.clear()
+    return events
+
+
+def test_completed_run_reports_every_step():
+    async def run():
+        job, task = _start({"source": "fresh"})
+        await task
+        return get_status(job)
+
+    status = asyncio.run(run())
+    assert set(status.values()) == {"completed"}
+    assert "ingest_courses_from_pdf" not in status
+    assert status["generate_pdf_report"] == "completed"
+
+
+def test_cancel_mid_step_reports_running_step_as_cancelled():
+    pipeline_service.ingest_courses_from_pdf_paths = _block_forever
+
+    async def run():
+        job, task = _start({"source": "pdf"})
+        sub = subscribe(job)
+        await asyncio.sleep(0.01)
+        await _cancel(job)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        unsubscribe(job, sub)
+        return job, _drain(sub)
+
+    job, events = asyncio.run(run())
+    assert get_status(job) == {"ingest_courses_from_pdf": "cancelled"}
+    assert orchestrator._is_terminal(events[-1])
+    assert job not in orchestrator.cancelled_jobs
+
+
+def test_cancel_while_queued_reports_first_step_as_cancelled():
+    pipeline_service.scrape_and_ingest = _block_forever
+
+    async def run():
+        running, running_task = _start({"source": "fresh"})
+        queued, queued_task = _start({"source": "fresh"})
+        sub = subscribe(queued)
+        await asyncio.sleep(0.01)
+        await _cancel(queued)
+        with pytest.raises(asyncio.CancelledError):
+            await queued_task
+        await _cancel(running)
+        await asyncio.gather(running_task, return_exceptions=True)
+        unsubscribe(queued, sub)
+        return queued, _drain(sub)
+
+    job, events = asyncio.run(run())
+    assert get_status(job) == {"scrape_jobs_from_google_jobs": "cancelled"}
+    assert len(events) == 1 and orchestrator._is_terminal(events[0])
+    assert job not in orchestrator.cancelled_jobs
+
+
+def test_cancel_between_steps_reports_next_step_as_cancelled():
+    jobs = []
+
+    async def scrape_then_cancel(*args, **kwargs):
+        # the cancel lands while the job yields after reporting scrape as completed
+        asyncio.get_running_loop().create_task(_cancel(jobs[0]))
+
+    pipeline_service.scrape_and_ingest = scrape_then_cancel
+
+    async def run():
+        job, task = _start({"source": "fresh"})
+        jobs.append(job)
+        sub = subscribe(job)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        unsubscribe(job, sub)
+        return job, _drain(sub)
+
+    job, events = asyncio.run(run())
+    assert get_status(job) == {
+        "scrape_jobs_from_google_jobs": "completed",
+        "extract_skills_from_jobs": "cancelled",
+        "extract_subject_skills_from_supabase": "cancelled",
+    }
+    assert orchestrator._is_terminal(events[-1])
+    assert job not in orchestrator.cancelled_jobs
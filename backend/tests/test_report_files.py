@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.endpoints import report_files
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    root = (tmp_path / "reports").resolve()
+    root.mkdir()
+    monkeypatch.setattr(report_files, "REPORTS_DIR", root)
+    return root
+
+
+def _status(filename):
+    with pytest.raises(HTTPException) as exc:
+        report_files._report_path(filename)
+    return exc.value.status_code
+
+
+def test_serves_plain_pdf(reports_dir):
+    (reports_dir / "syllabus_job_alignment-20250101_120000.pdf").write_bytes(b"%PDF-1.4")
+    path = report_files._report_path("syllabus_job_alignment-20250101_120000.pdf")
+    assert path == reports_dir / "syllabus_job_alignment-20250101_120000.pdf"
+
+
+@pytest.mark.parametrize("name", ["../secret.pdf", "a/b.pdf", "a\\b.pdf", "report.txt", ".pdf", "x.pdf\n"])
+def test_rejects_unsafe_names(reports_dir, name):
+    assert _status(name) == 400
+
+
+def test_missing_report_is_404(reports_dir):
+    assert _status("missing.pdf") == 404
+
+
+def test_symlink_out_of_reports_dir_is_404(reports_dir, tmp_path):
+    outside = tmp_path / "secret.pdf"
+    outside.write_bytes(b"%PDF-1.4 secret")
+    (reports_dir / "link.pdf").symlink_to(outside)
+    assert _status("link.pdf") == 404
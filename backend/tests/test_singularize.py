@@ -0,0 +1,29 @@
+import pytest
+
+from app.api.endpoints.dashboard import _singularize
+
+
+@pytest.mark.parametrize("skill, expected", [
+    # acronym plurals
+    ("rest apis", "rest api"),
+    ("restful apis", "restful api"),
+    ("data kpis", "data kpi"),
+    ("mobile uis", "mobile ui"),
+    # regular plurals
+    ("technologies", "technology"),
+    ("business processes", "business process"),
+    ("database indexes", "database index"),
+    ("web services", "web service"),
+    # singulars that end in "s"
+    ("data analysis", "data analysis"),
+    ("risk analysis", "risk analysis"),
+    ("project status", "project status"),
+    ("data analytics", "data analytics"),
+    ("small business", "small business"),
+    # known non-plurals
+    ("express js", "express js"),
+    ("ms windows", "ms windows"),
+    ("ci jenkins", "ci jenkins"),
+])
+def test_singularize(skill, expected):
+    assert _singularize(skill) == expected
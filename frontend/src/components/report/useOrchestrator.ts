@@ -256,39 +256,43 @@ export function useOrchestrator() {
       es.onmessage = (evt) => {
         if (!evt.data) return;
         try {
-          const payload = JSON.parse(evt.data);
-
-          if (payload?.type === 'error') {
-            const failedFn: string | undefined = payload.failed_at || payload.function;
-            if (failedFn) {
-              setSteps((prev) =>
-                prev.map((s) => (s.fn === failedFn ? { ...s, status: 'error' as StepStatus } : s))
-              );
+          const data = JSON.parse(evt.data);
+          // steps that change together arrive as one { batch: [...] } frame
+          const events: any[] = Array.isArray(data?.batch) ? data.batch : [data];
+
+          for (const payload of events) {
+            if (payload?.type === 'error') {
+              const failedFn: string | undefined = payload.failed_at || payload.function;
+              if (failedFn) {
+                setSteps((prev) =>
+                  prev.map((s) => (s.fn === failedFn ? { ...s, status: 'error' as StepStatus } : s))
+                );
+              }
+              setIsProcessing(false);
+              closeStream();
+              if (!cancelledRef.current && id) pollStatus(id);
+              return;
             }
-            setIsProcessing(false);
-            closeStream();
-            if (!cancelledRef.current && id) pollStatus(id);
-            return;
-          }
 
-          if (payload.reportUrl) setReportUrl(String(payload.reportUrl));
+            if (payload.reportUrl) setReportUrl(String(payload.reportUrl));
 
-          const fn: string | undefined = payload.function;
-          const st: string | undefined = payload.status;
+            const fn: string | undefined = payload.function;
+            const st: string | undefined = payload.status;
 
-          if (fn && st) {
-            setSteps((prev) =>
-              prev.map((s) => (s.fn === fn ? { ...s, status: mapStatus(st) } : s))
-            );
-          }
+            if (fn && st) {
+              setSteps((prev) =>
+                prev.map((s) => (s.fn === fn ? { ...s, status: mapStatus(st) } : s))
+              );
+            }
 
-          if (fn === 'generate_pdf_report' && st === 'completed') {
-            setIsComplete(true);
-            setIsProcessing(false);
-            closeStream();
-          }
-          if (st === 'error') {
-            setIsProcessing(false);
+            if (fn === 'generate_pdf_report' && st === 'completed') {
+              setIsComplete(true);
+              setIsProcessing(false);
+              closeStream();
+            }
+            if (st === 'error') {
+              setIsProcessing(false);
+            }
           }
         } catch {
           // keep-alives or non-JSON; ignore